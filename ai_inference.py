@@ -6,26 +6,227 @@ from typing import Dict, List, Optional, Any, Tuple
 import re
 from datetime import datetime
 
-from config import PROFESSION_KEYWORDS, COMPANY_DOMAINS
+from config import PROFESSION_KEYWORDS, COMPANY_DOMAINS, PH_LOCATIONS, PH_LOCATION_TITLES
+from text_processor import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
+# Profession specializations, grouped by service category
+_MEDICAL_SPECS = (
+    'cardiology', 'cardiologist', 'pediatrics', 'pediatrician',
+    'neurology', 'neurologist', 'surgery', 'surgeon',
+    'dermatology', 'dermatologist', 'ophthalmology', 'ophthalmologist',
+    'psychiatry', 'psychiatrist', 'radiology', 'radiologist'
+)
+
+_LEGAL_SPECS = (
+    'family law', 'corporate law', 'criminal law', 'tax law',
+    'labor law', 'real estate law', 'intellectual property',
+    'litigation', 'corporate counsel'
+)
+
+_ENGINEERING_SPECS = (
+    'civil engineering', 'electrical engineering', 'mechanical engineering',
+    'chemical engineering', 'software engineering', 'systems engineering',
+    'construction', 'architecture'
+)
+
+_BUSINESS_SPECS = (
+    'accounting', 'finance', 'marketing', 'human resources',
+    'operations', 'consulting', 'strategy', 'business development'
+)
+
+_ALL_SPECS_LOWER = frozenset(
+    spec.lower()
+    for specs in (_MEDICAL_SPECS, _LEGAL_SPECS, _ENGINEERING_SPECS, _BUSINESS_SPECS)
+    for spec in specs
+)
+
+# Fragments marking a specialization as relevant to an inferred profession;
+# other professions have no filter, so their first hint is used
+_PROFESSION_SPEC_FRAGMENTS = {
+    'Medical': ('cardio', 'pediatr', 'neuro', 'surg', 'dermat', 'ophthal', 'psych', 'radio'),
+    'Legal': ('law', 'legal', 'litigation', 'counsel'),
+    'Engineering': ('engineering', 'engineer', 'construction', 'architect')
+}
+
+# Email domain labels and substrings that hint at the kind of employer
+_EDU_GOV = {
+    'edu': 'educational institution',
+    'gov': 'government agency'
+}
+
+# Whole-label matchers, e.g. 'edu' in 'up.edu.ph' but not in 'education.com'
+_EDU_GOV_LABELS = tuple(
+    (re.compile(rf'(?:^|\.){label}(?:\.|$)'), institution)
+    for label, institution in _EDU_GOV.items()
+)
+
+_DOMAIN_CATEGORY_PRIORITY = ('medical institution', 'law firm', 'business corporation')
+
+_DOMAIN_INDICATORS = {
+    'hospital': 'medical institution',
+    'medical': 'medical institution',
+    'clinic': 'medical institution',
+    'health': 'medical institution',
+    'law': 'law firm',
+    'legal': 'law firm',
+    'attorney': 'law firm',
+    'corp': 'business corporation',
+    'inc': 'business corporation',
+    'company': 'business corporation',
+    'consulting': 'business corporation',
+    'group': 'business corporation'
+}
+
+_DOMAIN_INDICATOR_MATCHER = KeywordMatcher(_DOMAIN_INDICATORS)
+
+# Address indicators for professional vs residential addresses
+_PROFESSIONAL_ADDRESS_INDICATORS = (
+    'office', 'building', 'tower', 'plaza', 'center', 'centre',
+    'floor', 'suite', 'room', 'unit', 'hospital', 'clinic',
+    'law office', 'firm', 'corporation', 'company', 'inc',
+    'makati cbd', 'ortigas center', 'bgc', 'eastwood'
+)
+
+_RESIDENTIAL_ADDRESS_INDICATORS = (
+    'subdivision', 'village', 'homes', 'residence', 'street',
+    'avenue', 'road', 'barangay', 'district', 'blk', 'lot'
+)
+
+# (professional, residential) score contributed by each indicator
+_ADDRESS_INDICATOR_SCORES = {
+    indicator: (
+        int(indicator in _PROFESSIONAL_ADDRESS_INDICATORS),
+        int(indicator in _RESIDENTIAL_ADDRESS_INDICATORS)
+    )
+    for indicator in _PROFESSIONAL_ADDRESS_INDICATORS + _RESIDENTIAL_ADDRESS_INDICATORS
+}
+
+_ADDRESS_INDICATOR_MATCHER = KeywordMatcher(list(_ADDRESS_INDICATOR_SCORES))
+
+# Trie node key holding the company for a complete domain
+_TRIE_COMPANY = None
+
+# Source reliability weights
+_SOURCE_WEIGHTS = {
+    'job_title': 1.0,      # Job title is most reliable
+    'company_name': 0.8,   # Company name is quite reliable
+    'email_domain': 0.6,   # Email domain gives good hints
+    'office_address': 0.4, # Office address gives some hints
+}
+
+# Keywords that boost the source weight
+_HIGH_CONF = frozenset([
+    'doctor', 'physician', 'lawyer', 'attorney', 'engineer',
+    'professor', 'teacher', 'manager', 'director', 'ceo'
+])
+
+def _compute_source_weight(source_type: str, keyword: str) -> float:
+    """Compute the source weight, boosted for high-confidence keywords."""
+    base_weight = _SOURCE_WEIGHTS.get(source_type, 0.5)
+    
+    if keyword.lower() in _HIGH_CONF:
+        base_weight *= 1.5
+    
+    return base_weight
+
+def _build_domain_trie(company_domains: Dict[str, str]) -> Dict[Optional[str], Any]:
+    """Build a reversed-label trie over known company domains ('com' -> 'petron' -> ...)."""
+    trie = {}
+    for company_domain, company in company_domains.items():
+        if not company:
+            continue
+        node = trie
+        for label in reversed(company_domain.lower().split('.')):
+            node = node.setdefault(label, {})
+        node[_TRIE_COMPANY] = company
+    return trie
+
+_DOMAIN_TRIE = _build_domain_trie(COMPANY_DOMAINS)
+
+def _build_keyword_professions(profession_keywords: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Map each lowercased keyword to every profession that lists it."""
+    keyword_professions = {}
+    for profession, keywords in profession_keywords.items():
+        for keyword in keywords:
+            keyword_professions.setdefault(keyword.lower(), []).append(profession)
+    return keyword_professions
+
+# Keyword-to-profession mappings
+_KEYWORD_MAPPING = {
+    keyword.lower(): profession
+    for profession, keywords in PROFESSION_KEYWORDS.items()
+    for keyword in keywords
+}
+_KEYWORD_PROFESSIONS = _build_keyword_professions(PROFESSION_KEYWORDS)
+
+# Integer ids for professions, so per-text scoring accumulates into a flat list
+_PROFESSIONS = tuple(PROFESSION_KEYWORDS)
+_PROFESSION_IDS = {profession: profession_id for profession_id, profession in enumerate(_PROFESSIONS)}
+_KEYWORD_PROFESSION_IDS = {
+    keyword: tuple(_PROFESSION_IDS[profession] for profession in professions)
+    for keyword, professions in _KEYWORD_PROFESSIONS.items()
+}
+
+# Single-scan matchers, built once instead of per-keyword substring tests
+_PROF_MATCHER = KeywordMatcher(list(_KEYWORD_PROFESSIONS))
+_SPEC_MATCHER = KeywordMatcher(_ALL_SPECS_LOWER)
+_LOC_MATCHER = KeywordMatcher(PH_LOCATIONS)
+
+# Weight of every (source type, keyword) hit
+_KEYWORD_WEIGHT = {
+    (source_type, keyword): _compute_source_weight(source_type, keyword)
+    for source_type in _SOURCE_WEIGHTS
+    for keyword in _KEYWORD_PROFESSIONS
+}
+
+# Normalization denominators per source type, indexed by profession id
+_MAX_SCORES_BY_SOURCE = {
+    source_type: [len(PROFESSION_KEYWORDS[profession]) * base_weight for profession in _PROFESSIONS]
+    for source_type, base_weight in _SOURCE_WEIGHTS.items()
+}
+
+class InferenceResult:
+    """Inferred profession fields for one member (None where nothing was inferred)."""
+    
+    __slots__ = (
+        'inferred_profession', 'inferred_profession_confidence', 'inferred_profession_source',
+        'inferred_service_category', 'inferred_service_category_confidence',
+        'inferred_specialization', 'inferred_specialization_confidence',
+        'inferred_work_location', 'inferred_work_location_confidence'
+    )
+    
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return only the inferred fields, ready to merge into member data."""
+        return {
+            field: getattr(self, field)
+            for field in self.__slots__
+            if getattr(self, field) is not None
+        }
+    
+    def __repr__(self) -> str:
+        return f"InferenceResult({self.to_dict()})"
+
 class ProfessionInferencer:
-    """AI-powered profession and service inference engine."""
+    """AI-powered profession and service inference engine.
+    
+    Lookup tables and matchers are built once at import and shared read-only
+    by every instance.
+    """
     
     def __init__(self):
         self.profession_keywords = PROFESSION_KEYWORDS
         self.company_domains = COMPANY_DOMAINS
-        
-        # Build keyword-to-profession mappings
-        self.keyword_mapping = {}
-        for profession, keywords in self.profession_keywords.items():
-            for keyword in keywords:
-                self.keyword_mapping[keyword.lower()] = profession
+        self.keyword_mapping = _KEYWORD_MAPPING
     
-    def infer_profession_info(self, member_data: Dict[str, Any]) -> Dict[str, Any]:
+    def infer_profession_info(self, member_data: Dict[str, Any]) -> InferenceResult:
         """Infer profession information from available member data."""
-        inference_results = {}
+        inference_results = InferenceResult()
         
         # Collect all text data for analysis
         text_sources = []
@@ -52,49 +253,46 @@ class ProfessionInferencer:
         if office_address:
             text_sources.append(('office_address', office_address))
         
-        # Analyze each source
-        profession_scores = {}
+        # Nothing to analyze (common for sparse imported rows)
+        if not text_sources:
+            return inference_results
+        
+        # Analyze each source, accumulating weighted scores per profession id
+        weighted_sums = [0.0] * len(_PROFESSIONS)
+        total_weights = [0.0] * len(_PROFESSIONS)
         specialization_hints = []
         location_hints = []
         
         for source_type, text in text_sources:
-            analysis = self._analyze_text_for_profession(text, source_type)
-            
-            # Aggregate profession scores
-            for profession, score in analysis.get('profession_scores', {}).items():
-                if profession not in profession_scores:
-                    profession_scores[profession] = []
-                profession_scores[profession].append((score, source_type))
-            
-            # Collect specializations and locations
-            specialization_hints.extend(analysis.get('specializations', []))
-            location_hints.extend(analysis.get('locations', []))
+            self._analyze_text_for_profession(
+                text, source_type, weighted_sums, total_weights, specialization_hints, location_hints
+            )
         
         # Determine best profession match
-        best_profession, best_confidence = self._determine_best_profession(profession_scores)
+        best_profession, best_confidence = self._determine_best_profession(weighted_sums, total_weights)
         
         if best_profession and best_confidence >= 0.5:
-            inference_results['inferred_profession'] = best_profession
-            inference_results['inferred_profession_confidence'] = best_confidence
-            inference_results['inferred_profession_source'] = 'ai_analysis'
+            inference_results.inferred_profession = best_profession
+            inference_results.inferred_profession_confidence = best_confidence
+            inference_results.inferred_profession_source = 'ai_analysis'
             
             # Map to service category
-            inference_results['inferred_service_category'] = best_profession
-            inference_results['inferred_service_category_confidence'] = best_confidence
+            inference_results.inferred_service_category = best_profession
+            inference_results.inferred_service_category_confidence = best_confidence
         
         # Infer specialization
         if specialization_hints:
             specialization = self._determine_specialization(specialization_hints, best_profession)
             if specialization:
-                inference_results['inferred_specialization'] = specialization
-                inference_results['inferred_specialization_confidence'] = 0.7
+                inference_results.inferred_specialization = specialization
+                inference_results.inferred_specialization_confidence = 0.7
         
         # Infer work location
         if location_hints:
             work_location = self._determine_work_location(location_hints, member_data)
             if work_location:
-                inference_results['inferred_work_location'] = work_location
-                inference_results['inferred_work_location_confidence'] = 0.8
+                inference_results.inferred_work_location = work_location
+                inference_results.inferred_work_location_confidence = 0.8
         
         return inference_results
     
@@ -105,192 +303,107 @@ class ProfessionInferencer:
         
         domain = email.split('@')[1].lower()
         
-        # Check known company domains
-        if domain in self.company_domains:
-            company = self.company_domains[domain]
-            if company:
-                return company
-        
-        # Analyze domain structure
-        domain_parts = domain.split('.')
-        
-        # Educational institutions
-        if 'edu' in domain_parts:
-            return 'educational institution'
-        
-        # Government
-        if 'gov' in domain_parts:
-            return 'government agency'
-        
-        # Medical
-        medical_indicators = ['hospital', 'medical', 'clinic', 'health']
-        if any(indicator in domain for indicator in medical_indicators):
-            return 'medical institution'
+        # Check known company domains, including their subdomains
+        company = self._lookup_company_domain(domain)
+        if company:
+            return company
         
-        # Legal
-        legal_indicators = ['law', 'legal', 'attorney']
-        if any(indicator in domain for indicator in legal_indicators):
-            return 'law firm'
+        # Educational institutions / government, by exact domain label
+        for label_pattern, institution in _EDU_GOV_LABELS:
+            if label_pattern.search(domain):
+                return institution
         
-        # Business/Corporate
-        business_indicators = ['corp', 'inc', 'company', 'consulting', 'group']
-        if any(indicator in domain for indicator in business_indicators):
-            return 'business corporation'
+        # Medical, legal, then business indicators from one scan of the domain
+        categories = [_DOMAIN_INDICATORS[indicator] for indicator in _DOMAIN_INDICATOR_MATCHER.find(domain)]
+        if categories:
+            return min(categories, key=_DOMAIN_CATEGORY_PRIORITY.index)
         
         return None
     
-    def _analyze_text_for_profession(self, text: str, source_type: str) -> Dict[str, Any]:
-        """Analyze text for profession indicators."""
+    def _lookup_company_domain(self, domain: str) -> Optional[str]:
+        """Find the company for the longest known domain that ``domain`` ends with."""
+        company = None
+        node = _DOMAIN_TRIE
+        for label in reversed(domain.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            company = node.get(_TRIE_COMPANY, company)
+        
+        return company
+    
+    def _analyze_text_for_profession(self, text: str, source_type: str,
+                                     weighted_sums: List[float], total_weights: List[float],
+                                     specialization_hints: List[str], location_hints: List[str]):
+        """Analyze text for profession indicators, accumulating into the caller's containers."""
         if not text:
-            return {}
+            return
         
         text_lower = text.lower()
-        results = {
-            'profession_scores': {},
-            'specializations': [],
-            'locations': []
-        }
         
-        # Score each profession based on keyword matches
-        for profession, keywords in self.profession_keywords.items():
-            score = 0.0
-            matched_keywords = []
-            
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    # Weight scores based on source type
-                    weight = self._get_source_weight(source_type, keyword)
-                    score += weight
-                    matched_keywords.append(keyword)
-            
+        # Accumulate keyword weights per profession id from a single scan
+        scores = [0.0] * len(_PROFESSIONS)
+        keyword_weight = _KEYWORD_WEIGHT
+        for keyword in _PROF_MATCHER.find(text_lower):
+            # Weight scores based on source type
+            weight = keyword_weight.get((source_type, keyword))
+            if weight is None:
+                weight = _compute_source_weight(source_type, keyword)
+            for profession_id in _KEYWORD_PROFESSION_IDS[keyword]:
+                scores[profession_id] += weight
+        
+        max_scores = _MAX_SCORES_BY_SOURCE.get(source_type)
+        if max_scores is None:
+            base_weight = self._get_source_weight(source_type, '')
+            max_scores = [len(self.profession_keywords[profession]) * base_weight
+                          for profession in _PROFESSIONS]
+        
+        # Normalize and add this source's weighted contribution
+        source_weight = _SOURCE_WEIGHTS.get(source_type, 0.5)
+        for profession_id, score in enumerate(scores):
             if score > 0:
-                # Normalize score
-                max_possible_score = len(keywords) * self._get_source_weight(source_type, '')
-                normalized_score = min(score / max_possible_score, 1.0)
-                results['profession_scores'][profession] = normalized_score
+                normalized_score = min(score / max_scores[profession_id], 1.0)
+                weighted_sums[profession_id] += normalized_score * source_weight
+                total_weights[profession_id] += source_weight
         
-        # Extract specializations
-        specializations = self._extract_specializations(text_lower)
-        results['specializations'] = specializations
-        
-        # Extract location hints
-        locations = self._extract_location_hints(text_lower)
-        results['locations'] = locations
-        
-        return results
+        # Collect specializations and location hints
+        specialization_hints.extend(self._extract_specializations(text_lower))
+        location_hints.extend(self._extract_location_hints(text_lower))
     
     def _get_source_weight(self, source_type: str, keyword: str) -> float:
         """Get weight for profession score based on source type."""
-        weights = {
-            'job_title': 1.0,      # Job title is most reliable
-            'company_name': 0.8,   # Company name is quite reliable
-            'email_domain': 0.6,   # Email domain gives good hints
-            'office_address': 0.4, # Office address gives some hints
-        }
-        
-        base_weight = weights.get(source_type, 0.5)
-        
-        # Boost for high-confidence keywords
-        high_confidence_keywords = [
-            'doctor', 'physician', 'lawyer', 'attorney', 'engineer', 
-            'professor', 'teacher', 'manager', 'director', 'ceo'
-        ]
+        if not keyword:
+            weight = _SOURCE_WEIGHTS.get(source_type)
+        else:
+            weight = _KEYWORD_WEIGHT.get((source_type, keyword))
         
-        if keyword.lower() in high_confidence_keywords:
-            base_weight *= 1.5
+        if weight is None:
+            weight = _compute_source_weight(source_type, keyword)
         
-        return base_weight
+        return weight
     
     def _extract_specializations(self, text: str) -> List[str]:
         """Extract profession specializations from text."""
-        specializations = []
-        
-        # Medical specializations
-        medical_specs = [
-            'cardiology', 'cardiologist', 'pediatrics', 'pediatrician',
-            'neurology', 'neurologist', 'surgery', 'surgeon',
-            'dermatology', 'dermatologist', 'ophthalmology', 'ophthalmologist',
-            'psychiatry', 'psychiatrist', 'radiology', 'radiologist'
-        ]
-        
-        # Legal specializations
-        legal_specs = [
-            'family law', 'corporate law', 'criminal law', 'tax law',
-            'labor law', 'real estate law', 'intellectual property',
-            'litigation', 'corporate counsel'
-        ]
-        
-        # Engineering specializations
-        engineering_specs = [
-            'civil engineering', 'electrical engineering', 'mechanical engineering',
-            'chemical engineering', 'software engineering', 'systems engineering',
-            'construction', 'architecture'
-        ]
-        
-        # Business specializations
-        business_specs = [
-            'accounting', 'finance', 'marketing', 'human resources',
-            'operations', 'consulting', 'strategy', 'business development'
-        ]
-        
-        all_specs = medical_specs + legal_specs + engineering_specs + business_specs
-        
-        for spec in all_specs:
-            if spec in text:
-                specializations.append(spec)
-        
-        return list(set(specializations))  # Remove duplicates
+        return _SPEC_MATCHER.find(text)
     
     def _extract_location_hints(self, text: str) -> List[str]:
         """Extract location hints from text."""
-        locations = []
-        
-        # Philippine cities and regions
-        ph_locations = [
-            'makati', 'manila', 'quezon city', 'pasig', 'taguig', 'mandaluyong',
-            'pasay', 'paranaque', 'las pinas', 'muntinlupa', 'marikina',
-            'cebu', 'davao', 'iloilo', 'bacolod', 'cagayan de oro',
-            'ortigas', 'bgc', 'alabang', 'eastwood', 'rockwell'
-        ]
-        
-        for location in ph_locations:
-            if location in text:
-                locations.append(location.title())
-        
-        return list(set(locations))
+        return [PH_LOCATION_TITLES[location] for location in _LOC_MATCHER.find(text)]
     
-    def _determine_best_profession(self, profession_scores: Dict[str, List[Tuple[float, str]]]) -> Tuple[Optional[str], float]:
-        """Determine the best profession match from aggregated scores."""
-        if not profession_scores:
-            return None, 0.0
-        
-        # Calculate weighted average for each profession
-        final_scores = {}
-        
-        for profession, score_sources in profession_scores.items():
-            if not score_sources:
-                continue
-            
-            # Calculate weighted average
-            total_weight = 0
-            weighted_sum = 0
-            
-            for score, source_type in score_sources:
-                weight = self._get_source_weight(source_type, '')
-                weighted_sum += score * weight
-                total_weight += weight
-            
+    def _determine_best_profession(self, weighted_sums: List[float], total_weights: List[float]) -> Tuple[Optional[str], float]:
+        """Determine the best profession match from per-profession weighted sums."""
+        # Weighted average per profession id; ties go to the earlier profession
+        best_id, best_score = None, -1.0
+        for profession_id, total_weight in enumerate(total_weights):
             if total_weight > 0:
-                final_scores[profession] = weighted_sum / total_weight
+                average = weighted_sums[profession_id] / total_weight
+                if average > best_score:
+                    best_id, best_score = profession_id, average
         
-        if not final_scores:
+        if best_id is None:
             return None, 0.0
         
-        # Get the best match
-        best_profession = max(final_scores, key=final_scores.get)
-        best_score = final_scores[best_profession]
-        
-        return best_profession, best_score
+        return _PROFESSIONS[best_id], best_score
     
     def _determine_specialization(self, specialization_hints: List[str], profession: Optional[str]) -> Optional[str]:
         """Determine the most likely specialization."""
@@ -298,20 +411,9 @@ class ProfessionInferencer:
             return None
         
         # Filter specializations relevant to the profession
-        relevant_specs = []
-        
-        if profession == 'Medical':
-            medical_keywords = ['cardio', 'pediatr', 'neuro', 'surg', 'dermat', 'ophthal', 'psych', 'radio']
-            relevant_specs = [spec for spec in specialization_hints 
-                            if any(keyword in spec.lower() for keyword in medical_keywords)]
-        elif profession == 'Legal':
-            legal_keywords = ['law', 'legal', 'litigation', 'counsel']
-            relevant_specs = [spec for spec in specialization_hints
-                            if any(keyword in spec.lower() for keyword in legal_keywords)]
-        elif profession == 'Engineering':
-            engineering_keywords = ['engineering', 'engineer', 'construction', 'architect']
-            relevant_specs = [spec for spec in specialization_hints
-                            if any(keyword in spec.lower() for keyword in engineering_keywords)]
+        fragments = _PROFESSION_SPEC_FRAGMENTS.get(profession, ())
+        relevant_specs = [spec for spec in specialization_hints
+                          if any(fragment in spec.lower() for fragment in fragments)]
         
         if relevant_specs:
             # Return the most specific specialization
@@ -343,24 +445,13 @@ class ProfessionInferencer:
         
         address_lower = address.lower()
         
-        # Professional indicators
-        professional_indicators = [
-            'office', 'building', 'tower', 'plaza', 'center', 'centre',
-            'floor', 'suite', 'room', 'unit', 'hospital', 'clinic',
-            'law office', 'firm', 'corporation', 'company', 'inc',
-            'makati cbd', 'ortigas center', 'bgc', 'eastwood'
-        ]
-        
-        # Residential indicators
-        residential_indicators = [
-            'subdivision', 'village', 'homes', 'residence', 'street',
-            'avenue', 'road', 'barangay', 'district', 'blk', 'lot'
-        ]
-        
-        professional_score = sum(1 for indicator in professional_indicators 
-                               if indicator in address_lower)
-        residential_score = sum(1 for indicator in residential_indicators 
-                              if indicator in address_lower)
+        # One scan over both indicator lists, counting each side
+        professional_score = 0
+        residential_score = 0
+        for indicator in _ADDRESS_INDICATOR_MATCHER.find(address_lower):
+            professional_hit, residential_hit = _ADDRESS_INDICATOR_SCORES[indicator]
+            professional_score += professional_hit
+            residential_score += residential_hit
         
         if professional_score > residential_score:
             return 'professional'
@@ -6,6 +6,9 @@ from pathlib import Path
 import sqlite3
 import logging
 import os
+import time
+import functools
+import threading
 from datetime import datetime
 
 from config import Config, LOGGING_CONFIG, DATABASE_PATH, SCHEMA_PATH
@@ -30,6 +33,29 @@ db_manager = DatabaseManager(DATABASE_PATH)
 data_processor = DataProcessor(db_manager)
 query_processor = QueryProcessor(db_manager)
 
+def ttl_cache(ttl: float):
+    """Cache a zero-argument function's result for ``ttl`` seconds (per process)."""
+    def decorator(func):
+        lock = threading.Lock()
+        state = {'value': None, 'expires': 0.0}
+        
+        @functools.wraps(func)
+        def wrapper():
+            with lock:
+                now = time.monotonic()
+                if now >= state['expires']:
+                    state['value'] = func()
+                    state['expires'] = now + ttl
+                return state['value']
+        
+        return wrapper
+    return decorator
+
+@ttl_cache(Config.HEALTH_CACHE_TTL)
+def cached_connection_check():
+    """Database connection check, refreshed at most every HEALTH_CACHE_TTL seconds."""
+    return db_manager.test_connection()
+
 @app.route('/')
 def index():
     """Main dashboard showing system status and quick stats."""
@@ -164,6 +190,7 @@ def member_detail(member_id):
 def api_stats():
     """API endpoint for real-time statistics."""
     try:
+        # DatabaseManager caches the aggregates until the next write
         stats = db_manager.get_system_stats()
         return jsonify(stats)
     except Exception as e:
@@ -175,7 +202,7 @@ def health_check():
     """Health check endpoint."""
     try:
         # Test database connection
-        db_manager.test_connection()
+        cached_connection_check()
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
@@ -233,7 +260,8 @@ def main():
         app.run(
             host=Config.HOST,
             port=Config.PORT,
-            debug=Config.DEBUG
+            debug=Config.DEBUG,
+            threaded=True  # Serve concurrent read-only searches in parallel
         )
         
     except Exception as e:
@@ -2,6 +2,7 @@
 # ============================================================================
 
 import os
+import re
 from pathlib import Path
 
 # Base directory
@@ -23,6 +24,9 @@ class Config:
     
     # Database
     DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 4))  # Idle read connections kept open
+    DB_WAL_MODE = os.environ.get('DB_WAL_MODE', 'True').lower() == 'true'  # Rollback journal when off
+    SEARCH_TRIGRAM = os.environ.get('SEARCH_TRIGRAM', 'True').lower() == 'true'  # Substring index; LIKE when off
     
     # File upload limits
     MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file upload
@@ -37,6 +41,9 @@ class Config:
     # Data quality thresholds
     MIN_DATA_COMPLETENESS = 0.3  # Minimum fields filled to consider record "complete"
     DATA_FRESHNESS_YEARS = 5     # Years after which data is considered "stale"
+    
+    # API response caching (seconds)
+    HEALTH_CACHE_TTL = 1
 
 # Logging configuration
 LOGGING_CONFIG = {
@@ -131,6 +138,17 @@ LOCATION_MAPPINGS = {
     'Manila City': 'Manila'
 }
 
+# Philippine cities and business districts recognized in free text
+PH_LOCATIONS = frozenset([
+    'makati', 'manila', 'quezon city', 'pasig', 'taguig', 'mandaluyong',
+    'pasay', 'paranaque', 'las pinas', 'muntinlupa', 'marikina',
+    'cebu', 'davao', 'iloilo', 'bacolod', 'cagayan de oro',
+    'ortigas', 'bgc', 'alabang', 'eastwood', 'rockwell'
+])
+
+# Display form of each PH location, precomputed once
+PH_LOCATION_TITLES = {location: location.title() for location in PH_LOCATIONS}
+
 # Batch normalization patterns
 BATCH_PATTERNS = [
     r'(\d{2,4})-([A-Z]+\d*)',  # 95-S, 2001-B1
@@ -140,6 +158,18 @@ BATCH_PATTERNS = [
     r'(\d{2,4})',  # Just numbers
 ]
 
+# BATCH_PATTERNS unioned into one regex, most specific alternative first.
+# Lookaheads skip a less specific alternative while a more specific one still
+# follows, matching the precedence of trying BATCH_PATTERNS in order.
+BATCH_REGEX = re.compile(
+    r'Batch\s+No[:\.]?\s*(?P<year1>\d{2,4})-(?P<code1>[A-Z]+\d*)'      # Batch No: 95-S
+    r'|Batch\s+(?P<year2>\d{2,4})-(?P<code2>[A-Z]+\d*)'                # Batch 95-S
+    r'|(?P<year3>\d{2,4})-(?P<code3>[A-Z]+\d*)'                         # 95-S, 2001-B1
+    r'|(?!.*\d{2}-[A-Z])Batch\s+(?P<year4>\d{2,4})'                     # Batch 99 (no letter)
+    r'|(?!.*(?:\d{2}-[A-Z]|Batch\s+\d{2}))(?P<year5>\d{2,4})',           # Just numbers
+    re.IGNORECASE | re.DOTALL
+)
+
 # Email domain to company mappings (for profession inference)
 COMPANY_DOMAINS = {
     'petron.com': 'Petron Corporation',
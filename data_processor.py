@@ -1,15 +1,20 @@
 # SJ Professional Directory - Data Processing Engine
 # ============================================================================
 
-import pandas as pd
 import re
 import logging
 from pathlib import Path
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, TYPE_CHECKING
 import json
 import os
-import chardet
+import importlib.util
+import multiprocessing
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial, lru_cache
 
 from config import (
     Config, RAW_FILES_DIR, SUPPORTED_FILE_TYPES, 
@@ -20,8 +25,174 @@ from database import DatabaseManager
 from text_processor import TextProcessor
 from ai_inference import ProfessionInferencer
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Optional faster Excel reader (pandas engine='calamine', pip install python-calamine)
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+# Record field patterns for unstructured text, compiled once
+_NAME_RE = re.compile(r'NAME:\s*([^\n]+)', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+
+# Maximal runs of email characters that contain an '@'. Only attempted at run
+# starts, so a single pass over the text is linear even for long '@'-free runs
+_EMAIL_RUN_RE = re.compile(r'(?<![a-zA-Z0-9._%+@-])[a-zA-Z0-9._%+-]*@[a-zA-Z0-9._%+@-]*')
+_BATCH_LINE_RE = re.compile(r'BATCH[:\s]*([^\n]+)', re.IGNORECASE)
+_PROFESSION_LINE_RE = re.compile(r'PROFESSION[:\s]*([^\n]+)', re.IGNORECASE)
+
+# Runs of 4+ printable ASCII characters (or tabs), as 'strings' reports them
+_PRINTABLE_RUN_RE = re.compile(rb'[\t\x20-\x7e]{4,}')
+
+# WordprocessingML tags read when extracting .docx text
+_DOCX_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_PARAGRAPH = f'{_DOCX_NS}p'
+_DOCX_TEXT = f'{_DOCX_NS}t'
+_DOCX_TAB = f'{_DOCX_NS}tab'
+_DOCX_BREAKS = (f'{_DOCX_NS}br', f'{_DOCX_NS}cr')
+
+@lru_cache(maxsize=1)
+def _get_pd():
+    """Import pandas on first use so workers and non-tabular imports skip its startup cost."""
+    import pandas as pd
+    return pd
+
+# Fields counted by the completeness score; the confidence bonuses test the same bits
+_COMPLETENESS_FIELDS = (
+    'full_name', 'primary_email', 'mobile_phone',
+    'current_profession', 'school_chapter', 'batch_normalized'
+)
+_EMAIL_BIT = 1 << _COMPLETENESS_FIELDS.index('primary_email')
+_PROFESSION_BIT = 1 << _COMPLETENESS_FIELDS.index('current_profession')
+_BATCH_BIT = 1 << _COMPLETENESS_FIELDS.index('batch_normalized')
+
+# Merge rules by column (names from the members table)
+_MERGE_SKIP_FIELDS = frozenset({'id', 'created_at', 'updated_at'})
+_MERGE_DATE_FIELDS = frozenset({
+    'primary_email_collected_date', 'secondary_email_collected_date',
+    'home_phone_collected_date', 'mobile_phone_collected_date', 'office_phone_collected_date',
+    'home_address_collected_date', 'office_address_collected_date',
+    'profession_collected_date', 'company_collected_date', 'job_title_collected_date',
+    'positions_collected_date', 'hobbies_collected_date', 'original_data_collected_date'
+})
+_MERGE_CONFIDENCE_FIELDS = frozenset({
+    'inferred_profession_confidence', 'inferred_specialization_confidence',
+    'inferred_service_category_confidence', 'inferred_work_location_confidence',
+    'confidence_score'
+})
+
+def _should_update(field: str, new_value: Any, existing_value: Any) -> bool:
+    """Whether a non-None incoming value should replace the stored one when merging."""
+    # Always update if existing field is empty
+    if not existing_value:
+        return True
+    
+    # For dates, keep the more recent one
+    if field in _MERGE_DATE_FIELDS:
+        return isinstance(new_value, (date, datetime)) and new_value > existing_value
+    
+    # For confidence scores, keep higher confidence
+    if field in _MERGE_CONFIDENCE_FIELDS:
+        return float(new_value) > float(existing_value)
+    
+    # For other fields, prefer longer/more complete values
+    return len(str(new_value)) > len(str(existing_value))
+
+def _find_emails(text: str) -> List[str]:
+    """Find emails like _EMAIL_RE.findall, running the backtracking pattern only on '@' runs."""
+    # Emails never span runs, so matching run by run gives the same results
+    emails = []
+    for run in _EMAIL_RUN_RE.findall(text):
+        emails.extend(_EMAIL_RE.findall(run))
+    return emails
+
+class MemberIndex:
+    """In-memory email and name-block index over stored members, for duplicate lookups.
+    
+    Names are blocked under the first three letters of each word, so a fuzzy
+    name match only compares against members sharing a word prefix. Adding a
+    member again re-keys it under its current emails and name.
+    """
+    
+    def __init__(self):
+        self.by_email = {}  # email -> ids of members with it, first indexed first
+        self.by_block = {}
+        self.rank = {}      # member id -> search ordering key (highest confidence, then name)
+        self.keys = {}      # member id -> (emails, normalized name) it is indexed under
+        self.max_id = 0
+    
+    def load(self, db: DatabaseManager):
+        """Add every stored member newer than the last one loaded."""
+        for member in db.get_member_keys(since_id=self.max_id):
+            self.add(member)
+    
+    def add(self, member: Dict[str, Any], member_id: Optional[int] = None):
+        """Index a member's emails and normalized name (under member_id, default member['id'])."""
+        if member_id is None:
+            member_id = member['id']
+        self.discard(member_id)
+        self.max_id = max(self.max_id, member_id)
+        self.rank[member_id] = (-(member.get('confidence_score') or 0), member.get('full_name') or '')
+        
+        emails = tuple(member[key] for key in ('primary_email', 'secondary_email') if member.get(key))
+        for email in emails:
+            ids = self.by_email.setdefault(email, [])
+            if member_id not in ids:
+                ids.append(member_id)
+        
+        name = member.get('full_name_normalized')
+        if name:
+            for block in self._blocks(name):
+                entries = self.by_block.setdefault(block, {})
+                entries[member_id] = name
+        self.keys[member_id] = (emails, name)
+    
+    def discard(self, member_id: int):
+        """Remove a member's email and name entries, if indexed."""
+        if member_id not in self.keys:
+            return
+        emails, name = self.keys.pop(member_id)
+        del self.rank[member_id]
+        for email in emails:
+            ids = self.by_email[email]
+            if member_id in ids:
+                ids.remove(member_id)
+            if not ids:
+                del self.by_email[email]
+        if name:
+            for block in self._blocks(name):
+                self.by_block[block].pop(member_id, None)
+    
+    def find_by_email(self, email: str, exclude=()) -> Optional[int]:
+        """Return the id of the first indexed member with this email not in exclude, if any."""
+        for member_id in self.by_email.get(email, ()):
+            if member_id not in exclude:
+                return member_id
+        return None
+    
+    def name_candidates(self, name: str) -> List[Tuple[int, str]]:
+        """Return (id, normalized name) for members in the name's blocks whose name contains it."""
+        # Containment and ordering as in the LIKE '%name%' member search, but only among members
+        # sharing a word prefix, so a name found inside a word ('ant' in 'maria santos') is
+        # missed; there is no 100-row cap either
+        name_lower = name.lower()
+        candidates = {}
+        for block in self._blocks(name):
+            for member_id, candidate in self.by_block.get(block, {}).items():
+                if name_lower in candidate.lower():
+                    candidates[member_id] = candidate
+        return sorted(candidates.items(), key=lambda item: self.rank[item[0]])
+    
+    @staticmethod
+    def _blocks(name: str) -> set:
+        return {word[:3] for word in name.lower().split()}
+
+def _parse_file_to_records(file_path: Path) -> Tuple[int, List[Dict[str, Any]]]:
+    """Parse and normalize one file in a worker process (no database access)."""
+    return DataProcessor(None)._parse_file(file_path)
+
 class DataProcessor:
     """Main data processing engine for importing and normalizing member data."""
     
@@ -29,6 +200,8 @@ class DataProcessor:
         self.db = db_manager
         self.text_processor = TextProcessor()
         self.ai_inferencer = ProfessionInferencer()
+        self.member_index = None
+        self.file_metadata = {}
         self.stats = {
             'files_processed': 0,
             'records_found': 0,
@@ -48,15 +221,30 @@ class DataProcessor:
         batch_id = self.db.create_import_batch(batch_name, [str(f) for f in source_files])
         
         try:
-            # Process each file
-            for file_path in source_files:
+            # Index stored members once for duplicate lookups during this import
+            self.member_index = MemberIndex()
+            self.member_index.load(self.db)
+            
+            # Parse files in worker processes; database writes stay in this process, in file order.
+            # Workers are spawned, not forked: this process already runs the database writer
+            # thread (and the app's own threads), whose held locks a fork would copy
+            imported = 0
+            workers = min(os.cpu_count() or 1, len(source_files))
+            if workers > 1:
                 try:
-                    self._process_file(file_path, batch_id)
-                    self.stats['files_processed'] += 1
-                except Exception as e:
-                    error_msg = f"Error processing {file_path}: {e}"
-                    logger.error(error_msg)
-                    self.stats['errors'].append(error_msg)
+                    with ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=multiprocessing.get_context('spawn')) as executor:
+                        futures = [executor.submit(_parse_file_to_records, file_path) for file_path in source_files]
+                        for file_path, future in zip(source_files, futures):
+                            self._import_parsed_file(file_path, future.result, batch_id)
+                            imported += 1
+                except BrokenProcessPool as e:
+                    logger.warning(f"Parse workers failed ({e}), parsing the remaining files in this process")
+            
+            for file_path in source_files[imported:]:
+                self._import_parsed_file(file_path, partial(self._parse_file, file_path), batch_id)
+            
+            self.member_index = None
             
             # Update batch with final results
             self.db.update_import_batch(batch_id, {
@@ -82,226 +270,312 @@ class DataProcessor:
             raise
     
     def _discover_files(self) -> List[Path]:
-        """Discover all supported files in Raw_Files directory."""
-        files = []
-        
-        # Main directory
-        for file_path in RAW_FILES_DIR.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_FILE_TYPES:
-                files.append(file_path)
-        
-        # Subdirectories
-        for subdir in ['UP Chapters', 'Other Chapters']:
-            subdir_path = RAW_FILES_DIR / subdir
-            if subdir_path.exists():
-                for file_path in subdir_path.iterdir():
-                    if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_FILE_TYPES:
-                        files.append(file_path)
+        """Discover all supported files in Raw_Files directory, including nested chapter folders."""
+        files = [file_path for file_path in RAW_FILES_DIR.rglob('*')
+                 if file_path.suffix.lower() in SUPPORTED_FILE_TYPES and file_path.is_file()]
         
         logger.info(f"Discovered {len(files)} files for processing")
         return files
     
-    def _process_file(self, file_path: Path, batch_id: int):
-        """Process a single file based on its type."""
+    def _import_parsed_file(self, file_path: Path, parse: Callable[[], Tuple[int, List[Dict[str, Any]]]], batch_id: int):
+        """Import one file's parsed records, recording any failure against the file."""
+        try:
+            records_found, staged = parse()
+            self.stats['records_found'] += records_found
+            self._import_normalized_members(staged, batch_id)
+            self.stats['files_processed'] += 1
+        except BrokenProcessPool:
+            # Not this file's fault: the caller re-parses it in this process
+            raise
+        except Exception as e:
+            error_msg = f"Error processing {file_path}: {e}"
+            logger.error(error_msg)
+            self.stats['errors'].append(error_msg)
+    
+    def _parse_file(self, file_path: Path) -> Tuple[int, List[Dict[str, Any]]]:
+        """Parse and normalize one file; returns (records found, normalized records)."""
+        members = self._extract_file_members(file_path)
+        # Metadata is only shared between records of the same parse
+        self.file_metadata.pop(file_path, None)
+        return len(members), self._normalize_members(members)
+    
+    def _extract_file_members(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Parse a single file into raw member records based on its type (no database access)."""
         file_type = SUPPORTED_FILE_TYPES.get(file_path.suffix.lower())
         
         logger.info(f"Processing {file_path} (type: {file_type})")
         
-        if file_type == 'excel_old':
-            self._process_excel_file(file_path, batch_id)
-        elif file_type == 'excel_new':
-            self._process_excel_file(file_path, batch_id)
-        elif file_type == 'word_old' or file_type == 'word_new':
-            self._process_word_file(file_path, batch_id)
-        elif file_type == 'access':
-            self._process_access_file(file_path, batch_id)
-        elif file_type == 'text':
-            self._process_text_file(file_path, batch_id)
-        elif file_type == 'csv':
-            self._process_csv_file(file_path, batch_id)
-        else:
+        handler = self._FILE_HANDLERS.get(file_type)
+        if handler is None:
             logger.warning(f"Unsupported file type: {file_type} for {file_path}")
+            return []
+        
+        return handler(self, file_path)
     
-    def _process_excel_file(self, file_path: Path, batch_id: int):
+    def _extract_excel_members(self, file_path: Path) -> List[Dict[str, Any]]:
         """Process Excel files (.xls, .xlsx)."""
         try:
+            pd = _get_pd()
             # Try to read Excel file
-            if file_path.suffix.lower() == '.xls':
+            if _HAS_CALAMINE:
+                # Rust-backed reader for both formats, when installed
+                df = pd.read_excel(file_path, engine='calamine', dtype=str)
+            elif file_path.suffix.lower() == '.xls':
                 # Old Excel format
-                df = pd.read_excel(file_path, engine='xlrd')
+                df = pd.read_excel(file_path, engine='xlrd', dtype=str)
             else:
                 # New Excel format
-                df = pd.read_excel(file_path, engine='openpyxl')
+                df = pd.read_excel(file_path, engine='openpyxl', dtype=str)
             
             logger.info(f"Read Excel file with {len(df)} rows and columns: {list(df.columns)}")
             
-            # Process each row
-            for idx, row in df.iterrows():
+            # Classify columns once, then process each row
+            column_fields = self._classify_columns(list(df.columns))
+            members = []
+            for idx, row in enumerate(self._dataframe_records(df)):
                 try:
-                    member_data = self._extract_member_from_excel_row(row, file_path)
+                    member_data = self._extract_member_from_excel_row(row, file_path, column_fields)
                     if member_data:
-                        self._import_member(member_data, batch_id)
-                        self.stats['records_found'] += 1
+                        members.append(member_data)
                 except Exception as e:
                     logger.warning(f"Error processing row {idx} in {file_path}: {e}")
             
+            return members
+        
         except Exception as e:
             logger.error(f"Error reading Excel file {file_path}: {e}")
             # Try alternative approach with strings extraction
-            self._process_file_with_strings(file_path, batch_id)
+            return self._extract_members_with_strings(file_path)
     
-    def _process_word_file(self, file_path: Path, batch_id: int):
+    def _extract_word_members(self, file_path: Path) -> List[Dict[str, Any]]:
         """Process Word documents (.doc, .docx)."""
         try:
-            # Try python-docx for .docx files
+            # Stream paragraph text straight out of .docx XML
             if file_path.suffix.lower() == '.docx':
-                from docx import Document
-                doc = Document(file_path)
-                text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+                text = self._extract_docx_text(file_path)
             else:
                 # For .doc files, fall back to strings extraction
                 text = self._extract_text_with_strings(file_path)
             
             # Extract member records from text
-            members = self._extract_members_from_text(text, file_path)
-            
-            for member_data in members:
-                self._import_member(member_data, batch_id)
-                self.stats['records_found'] += 1
+            return self._extract_members_from_text(text, file_path)
                 
         except Exception as e:
             logger.error(f"Error processing Word file {file_path}: {e}")
             # Fallback to strings extraction
-            self._process_file_with_strings(file_path, batch_id)
+            return self._extract_members_with_strings(file_path)
     
-    def _process_text_file(self, file_path: Path, batch_id: int):
+    def _extract_docx_text(self, file_path: Path) -> str:
+        """Extract body paragraph text from a .docx without building a document model."""
+        paragraphs = []
+        depth = 0           # element depth below the document root
+        paragraph_depth = None
+        parts = []
+        
+        with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as source:
+            for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    # Top-level body paragraphs only (document/body/p), like python-docx
+                    if element.tag == _DOCX_PARAGRAPH and depth == 3:
+                        paragraph_depth = depth
+                        parts = []
+                    continue
+                
+                if paragraph_depth is not None:
+                    if element.tag == _DOCX_TEXT:
+                        parts.append(element.text or '')
+                    elif element.tag == _DOCX_TAB:
+                        parts.append('\t')
+                    elif element.tag in _DOCX_BREAKS:
+                        parts.append('\n')
+                    elif element.tag == _DOCX_PARAGRAPH and depth == paragraph_depth:
+                        paragraphs.append(''.join(parts))
+                        paragraph_depth = None
+                
+                depth -= 1
+                # Free finished top-level elements as we go
+                if depth == 2:
+                    element.clear()
+        
+        return '\n'.join(paragraphs)
+    
+    def _extract_text_file_members(self, file_path: Path) -> List[Dict[str, Any]]:
         """Process text files."""
         try:
-            # Detect encoding
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-            
-            # Read text
-            with open(file_path, 'r', encoding=encoding) as f:
-                text = f.read()
+            text = self._decode_text(file_path.read_bytes())
             
             # Extract member data
             if 'names.txt' in file_path.name.lower():
                 # Special handling for email list files
-                self._process_email_list(text, file_path, batch_id)
+                return self._extract_email_list(text, file_path)
             else:
                 # General text processing
-                members = self._extract_members_from_text(text, file_path)
-                for member_data in members:
-                    self._import_member(member_data, batch_id)
-                    self.stats['records_found'] += 1
+                return self._extract_members_from_text(text, file_path)
                     
         except Exception as e:
             logger.error(f"Error processing text file {file_path}: {e}")
+            return []
     
-    def _process_access_file(self, file_path: Path, batch_id: int):
+    def _decode_text(self, raw_data: bytes) -> str:
+        """Decode file bytes, trying UTF-8 before running encoding detection."""
+        try:
+            text = raw_data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            import chardet
+            # Detect encoding from a prefix; 64 KB is plenty for a confident guess
+            encoding = chardet.detect(raw_data[:65536])['encoding'] or 'utf-8'
+            text = raw_data.decode(encoding)
+        
+        # Universal newlines, as text-mode reads did
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    
+    def _extract_access_members(self, file_path: Path) -> List[Dict[str, Any]]:
         """Process Access database files (.mdb)."""
         # Access files are complex - for now, extract strings and parse
         logger.info(f"Processing Access file {file_path} with strings extraction")
-        self._process_file_with_strings(file_path, batch_id)
+        return self._extract_members_with_strings(file_path)
     
-    def _process_csv_file(self, file_path: Path, batch_id: int):
+    def _extract_csv_members(self, file_path: Path) -> List[Dict[str, Any]]:
         """Process CSV files."""
         try:
-            df = pd.read_csv(file_path)
+            pd = _get_pd()
+            # Every cell is used as text; skip type inference but keep NA markers as missing
+            df = pd.read_csv(file_path, dtype=str)
             logger.info(f"Read CSV file with {len(df)} rows and columns: {list(df.columns)}")
             
-            for idx, row in df.iterrows():
+            column_fields = self._classify_columns(list(df.columns))
+            members = []
+            for idx, row in enumerate(self._dataframe_records(df)):
                 try:
-                    member_data = self._extract_member_from_excel_row(row, file_path)
+                    member_data = self._extract_member_from_excel_row(row, file_path, column_fields)
                     if member_data:
-                        self._import_member(member_data, batch_id)
-                        self.stats['records_found'] += 1
+                        members.append(member_data)
                 except Exception as e:
                     logger.warning(f"Error processing CSV row {idx}: {e}")
+            
+            return members
                     
         except Exception as e:
             logger.error(f"Error processing CSV file {file_path}: {e}")
+            return []
+    
+    # File type (from SUPPORTED_FILE_TYPES) -> extractor
+    _FILE_HANDLERS = {
+        'excel_old': _extract_excel_members,
+        'excel_new': _extract_excel_members,
+        'word_old': _extract_word_members,
+        'word_new': _extract_word_members,
+        'access': _extract_access_members,
+        'text': _extract_text_file_members,
+        'csv': _extract_csv_members,
+    }
     
-    def _process_file_with_strings(self, file_path: Path, batch_id: int):
+    def _extract_members_with_strings(self, file_path: Path) -> List[Dict[str, Any]]:
         """Fallback method using strings extraction."""
         try:
             text = self._extract_text_with_strings(file_path)
-            members = self._extract_members_from_text(text, file_path)
-            
-            for member_data in members:
-                self._import_member(member_data, batch_id)
-                self.stats['records_found'] += 1
+            return self._extract_members_from_text(text, file_path)
                 
         except Exception as e:
             logger.error(f"Error processing file with strings {file_path}: {e}")
+            return []
     
     def _extract_text_with_strings(self, file_path: Path) -> str:
-        """Extract text using system 'strings' command."""
-        import subprocess
+        """Extract printable text runs from a binary file, like the 'strings' command."""
         try:
-            result = subprocess.run(['strings', str(file_path)], 
-                                  capture_output=True, text=True)
-            return result.stdout
+            runs = _PRINTABLE_RUN_RE.findall(file_path.read_bytes())
+            return b''.join(run + b'\n' for run in runs).decode('ascii')
         except Exception as e:
-            logger.error(f"Error running strings on {file_path}: {e}")
+            logger.error(f"Error extracting strings from {file_path}: {e}")
             return ""
     
-    def _extract_member_from_excel_row(self, row: pd.Series, file_path: Path) -> Optional[Dict[str, Any]]:
-        """Extract member data from Excel row."""
-        # This is a generic extractor - would need customization based on actual Excel structure
-        member_data = {}
-        
-        # Try to map common column names
-        for col in row.index:
+    def _dataframe_records(self, df: 'pd.DataFrame') -> List[Dict[str, Any]]:
+        """Convert a DataFrame to plain row dicts in one pass, with missing cells as None."""
+        columns = list(df.columns)
+        cleaned = df.astype(object).where(df.notna(), None)
+        return [dict(zip(columns, row)) for row in cleaned.itertuples(index=False, name=None)]
+    
+    def _classify_columns(self, columns: List[Any]) -> List[Tuple[Any, Optional[str]]]:
+        """Map each column to the member field its values fill, classifying names once per file.
+        
+        Columns that match no field map to None; their values are still used as
+        the primary email when they contain '@'.
+        """
+        column_fields = []
+        for col in columns:
             col_lower = str(col).lower()
-            value = row[col]
-            
-            if pd.isna(value) or value == '':
-                continue
-                
-            value = str(value).strip()
             
             # Name fields
             if any(name_field in col_lower for name_field in ['name', 'nome', 'apellido']):
-                member_data['full_name'] = value
+                field = 'full_name'
             elif 'nickname' in col_lower or 'nick' in col_lower:
-                member_data['nickname'] = value
+                field = 'nickname'
             
             # Contact fields
-            elif 'email' in col_lower or '@' in value:
-                member_data['primary_email'] = value
+            elif 'email' in col_lower:
+                field = 'primary_email'
             elif any(phone_field in col_lower for phone_field in ['phone', 'mobile', 'cell', 'tel']):
                 if 'home' in col_lower:
-                    member_data['home_phone'] = value
-                elif 'mobile' in col_lower or 'cell' in col_lower:
-                    member_data['mobile_phone'] = value
+                    field = 'home_phone'
                 else:
-                    member_data['mobile_phone'] = value
+                    field = 'mobile_phone'
             
             # Address fields
             elif 'address' in col_lower:
                 if 'home' in col_lower:
-                    member_data['home_address_full'] = value
+                    field = 'home_address_full'
                 elif 'office' in col_lower or 'work' in col_lower:
-                    member_data['office_address_full'] = value
+                    field = 'office_address_full'
                 else:
-                    member_data['home_address_full'] = value
+                    field = 'home_address_full'
             
             # Professional fields
             elif any(prof_field in col_lower for prof_field in ['profession', 'job', 'work', 'occupation']):
-                member_data['current_profession'] = value
+                field = 'current_profession'
             elif 'company' in col_lower or 'employer' in col_lower:
-                member_data['current_company'] = value
+                field = 'current_company'
             
             # Academic fields
             elif 'batch' in col_lower:
-                member_data['batch_original'] = value
+                field = 'batch_original'
             elif 'chapter' in col_lower or 'school' in col_lower:
-                member_data['school_chapter'] = value
+                field = 'school_chapter'
             elif 'course' in col_lower:
-                member_data['course'] = value
+                field = 'course'
+            else:
+                field = None
+            
+            column_fields.append((col, field))
+        
+        return column_fields
+    
+    def _extract_member_from_excel_row(self, row: Dict[str, Any], file_path: Path,
+                                       column_fields: Optional[List[Tuple[Any, Optional[str]]]] = None) -> Optional[Dict[str, Any]]:
+        """Extract member data from Excel row."""
+        # This is a generic extractor - would need customization based on actual Excel structure
+        if column_fields is None:
+            column_fields = self._classify_columns(list(row))
+        
+        member_data = {}
+        
+        for col, field in column_fields:
+            value = row[col]
+            
+            if value is None:
+                continue
+            
+            # Readers load every column as str
+            value = value.strip()
+            if not value:
+                continue
+            
+            # Any non-name value containing '@' is taken as the email
+            if field not in ('full_name', 'nickname') and '@' in value:
+                field = 'primary_email'
+            
+            if field:
+                member_data[field] = value
         
         # Only return if we have at least a name or email
         if member_data.get('full_name') or member_data.get('primary_email'):
@@ -314,18 +588,11 @@ class DataProcessor:
         """Extract member records from unstructured text."""
         members = []
         
-        # Look for structured member records
-        # Pattern 1: NAME: value format
-        name_pattern = r'NAME:\s*([^\n]+)'
-        email_pattern = r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        batch_pattern = r'BATCH[:\s]*([^\n]+)'
-        profession_pattern = r'PROFESSION[:\s]*([^\n]+)'
-        
-        # Find all matches
-        names = re.findall(name_pattern, text, re.IGNORECASE)
-        emails = re.findall(email_pattern, text)
-        batches = re.findall(batch_pattern, text, re.IGNORECASE)
-        professions = re.findall(profession_pattern, text, re.IGNORECASE)
+        # Look for structured member records (NAME: value format)
+        names = _NAME_RE.findall(text)
+        emails = _find_emails(text)
+        batches = _BATCH_LINE_RE.findall(text)
+        professions = _PROFESSION_LINE_RE.findall(text)
         
         # Try to correlate them (this is approximate)
         for i, name in enumerate(names):
@@ -343,8 +610,10 @@ class DataProcessor:
             members.append(member_data)
         
         # Also extract standalone emails
+        seen_emails = {m['primary_email'] for m in members if m.get('primary_email')}
         for email in emails:
-            if not any(email in str(m.get('primary_email', '')) for m in members):
+            if email not in seen_emails:
+                seen_emails.add(email)
                 member_data = {
                     'primary_email': email
                 }
@@ -353,9 +622,10 @@ class DataProcessor:
         
         return members
     
-    def _process_email_list(self, text: str, file_path: Path, batch_id: int):
+    def _extract_email_list(self, text: str, file_path: Path) -> List[Dict[str, Any]]:
         """Process email list files like names.txt."""
         lines = text.strip().split('\n')
+        members = []
         
         for line in lines:
             line = line.strip()
@@ -364,22 +634,27 @@ class DataProcessor:
                     'primary_email': line
                 }
                 member_data.update(self._add_file_metadata(file_path))
-                self._import_member(member_data, batch_id)
-                self.stats['records_found'] += 1
+                members.append(member_data)
+        
+        return members
     
     def _add_file_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """Add file metadata to member record."""
-        file_stat = file_path.stat()
+        """Add file metadata to member record (computed once per file)."""
+        metadata = self.file_metadata.get(file_path)
+        if metadata is None:
+            file_stat = file_path.stat()
+            metadata = {
+                'source_file_name': file_path.name,
+                'source_file_creation_date': datetime.fromtimestamp(file_stat.st_ctime).date(),
+                'source_file_modified_date': datetime.fromtimestamp(file_stat.st_mtime).date(),
+                'imported_from_source': str(file_path),
+                'estimated_data_vintage': self._estimate_data_vintage(file_path, file_stat)
+            }
+            self.file_metadata[file_path] = metadata
         
-        return {
-            'source_file_name': file_path.name,
-            'source_file_creation_date': datetime.fromtimestamp(file_stat.st_ctime).date(),
-            'source_file_modified_date': datetime.fromtimestamp(file_stat.st_mtime).date(),
-            'imported_from_source': str(file_path),
-            'estimated_data_vintage': self._estimate_data_vintage(file_path)
-        }
+        return metadata
     
-    def _estimate_data_vintage(self, file_path: Path) -> date:
+    def _estimate_data_vintage(self, file_path: Path, file_stat: Optional[os.stat_result] = None) -> date:
         """Estimate when the data was originally collected."""
         filename = file_path.name.lower()
         
@@ -394,172 +669,248 @@ class DataProcessor:
             return date(1995, 1, 1)  # Mid-90s
         
         # Fallback to file modification date
-        file_stat = file_path.stat()
+        if file_stat is None:
+            file_stat = file_path.stat()
         return datetime.fromtimestamp(file_stat.st_mtime).date()
     
-    def _import_member(self, member_data: Dict[str, Any], batch_id: int):
-        """Import or update a member record."""
-        try:
-            # Normalize the data
-            normalized_data = self._normalize_member_data(member_data)
-            
-            # Check for existing member
-            existing_member = self._find_existing_member(normalized_data)
-            
-            if existing_member:
-                # Update existing record
-                updates = self._merge_member_data(existing_member, normalized_data)
-                if updates:
-                    self.db.update_member(existing_member['id'], updates)
-                    self.stats['records_updated'] += 1
-                    logger.debug(f"Updated member {existing_member['id']}")
+    def _normalize_members(self, members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize raw member records, logging and skipping any that fail."""
+        staged = []
+        for member_data in members:
+            try:
+                staged.append(self._normalize_member_data(member_data))
+            except Exception as e:
+                logger.error(f"Error importing member: {e}")
+                logger.error(f"Member data: {member_data}")
+        return staged
+    
+    def _import_normalized_members(self, staged: List[Dict[str, Any]], batch_id: int):
+        """Import or update normalized member records with batched lookups and one write transaction."""
+        if not staged:
+            return
+        
+        # Outside a full import, index the stored members for just this call
+        member_index = self.member_index
+        if member_index is None:
+            member_index = MemberIndex()
+            member_index.load(self.db)
+        
+        # Prefetch the stored members the records match before this file's changes, in one query;
+        # matches that those changes redirect elsewhere are fetched when needed
+        prefetch_ids = set()
+        for member in staged:
+            if member.get('primary_email'):
+                prefetch_ids.add(member_index.find_by_email(member['primary_email']))
+            prefetch_ids.add(self._find_existing_member(member, member_index))
+        prefetch_ids.discard(None)
+        stored_members = self.db.get_members_by_ids(list(prefetch_ids))
+        
+        # Records created or updated earlier in this file, indexed under their current values
+        # (stored ids for updated members, negative ids for new ones) so later records match
+        # them the same way they match stored members
+        file_index = MemberIndex()
+        file_records = {}
+        member_updates = {}     # member id -> accumulated updates
+        new_members = []        # records to insert, in file order
+        records_updated = 0
+        
+        def existing_record(member_id: int) -> Optional[Dict[str, Any]]:
+            if member_id in file_records:
+                return file_records[member_id]
+            if member_id not in stored_members:
+                stored_members.update(self.db.get_members_by_ids([member_id]))
+            return stored_members.get(member_id)
+        
+        for normalized_data in staged:
+            try:
+                email = normalized_data.get('primary_email')
+                
+                # Check for existing member by email, then by name; members changed earlier in
+                # this file match on their current values only
+                target_id = None
+                if email:
+                    target_id = file_index.find_by_email(email)
+                    if target_id is None:
+                        target_id = member_index.find_by_email(email, exclude=file_records)
+                if target_id is None:
+                    target_id = self._find_existing_member(normalized_data, member_index, file_index)
+                target = existing_record(target_id) if target_id is not None else None
+                
+                if target is not None:
+                    # Update existing record
+                    updates = self._merge_member_data(target, normalized_data)
+                    if not updates:
+                        continue
+                    target.update(updates)
+                    if target_id > 0:
+                        member_updates.setdefault(target_id, {}).update(updates)
+                    file_records[target_id] = target
+                    file_index.add(target, member_id=target_id)
+                    records_updated += 1
                 else:
-                    logger.debug(f"No updates needed for member {existing_member['id']}")
-            else:
-                # Create new record
-                member_id = self.db.insert_member(normalized_data)
+                    # Create new record
+                    new_members.append(normalized_data)
+                    target_id = -len(new_members)
+                    file_records[target_id] = normalized_data
+                    file_index.add(normalized_data, member_id=target_id)
+            
+            except Exception as e:
+                logger.error(f"Error importing member: {e}")
+                logger.error(f"Member data: {normalized_data}")
+        
+        try:
+            self.db.bulk_write_members(new_members, member_updates)
+            self.stats['records_imported'] += len(new_members)
+            self.stats['records_updated'] += records_updated
+            logger.debug(f"Created {len(new_members)} and updated {len(member_updates)} members")
+        except Exception as e:
+            # Salvage what we can: one bad record shouldn't drop the whole file
+            logger.warning(f"Batch write failed ({e}), writing records one at a time")
+            self._write_members_individually(new_members, member_updates)
+        
+        # Keep the import's index current: new rows, plus the updated members' current emails/names
+        if self.member_index is not None:
+            for member_id in member_updates:
+                self.member_index.add(file_records[member_id])
+            self.member_index.load(self.db)
+    
+    def _write_members_individually(self, new_members: List[Dict[str, Any]],
+                                    member_updates: Dict[int, Dict[str, Any]]):
+        """Write records one per transaction, logging and skipping failures."""
+        for member_id, updates in member_updates.items():
+            try:
+                self.db.update_member(member_id, updates)
+                self.stats['records_updated'] += 1
+                logger.debug(f"Updated member {member_id}")
+            except Exception as e:
+                logger.error(f"Error importing member: {e}")
+                logger.error(f"Member data: {updates}")
+        
+        for member_data in new_members:
+            try:
+                member_id = self.db.insert_member(member_data)
                 self.stats['records_imported'] += 1
                 logger.debug(f"Created new member {member_id}")
-                
-        except Exception as e:
-            logger.error(f"Error importing member: {e}")
-            logger.error(f"Member data: {member_data}")
+            except Exception as e:
+                logger.error(f"Error importing member: {e}")
+                logger.error(f"Member data: {member_data}")
     
     def _normalize_member_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize member data using various processors."""
-        normalized = raw_data.copy()
+        """Normalize member data in place using various processors (the record is owned by the parse)."""
+        normalized = raw_data
+        text_processor = self.text_processor
         
         # Normalize name
-        if normalized.get('full_name'):
-            normalized['full_name_normalized'] = self.text_processor.normalize_name(
-                normalized['full_name']
-            )
+        full_name = normalized.get('full_name')
+        if full_name:
+            normalized['full_name_normalized'] = text_processor.normalize_name(full_name)
         
         # Normalize batch
-        if normalized.get('batch_original'):
-            batch_info = self.text_processor.normalize_batch(normalized['batch_original'])
-            normalized.update(batch_info)
+        batch_original = normalized.get('batch_original')
+        if batch_original:
+            normalized.update(text_processor.normalize_batch(batch_original))
         
         # Normalize locations
-        if normalized.get('home_address_full'):
-            home_city = self.text_processor.extract_city(normalized['home_address_full'])
+        home_address = normalized.get('home_address_full')
+        if home_address:
+            home_city = text_processor.extract_city(home_address)
             normalized['home_address_city'] = home_city
-            normalized['home_address_city_normalized'] = self.text_processor.normalize_location(home_city)
+            normalized['home_address_city_normalized'] = text_processor.normalize_location(home_city)
         
-        if normalized.get('office_address_full'):
-            office_city = self.text_processor.extract_city(normalized['office_address_full'])
+        office_address = normalized.get('office_address_full')
+        if office_address:
+            office_city = text_processor.extract_city(office_address)
             normalized['office_address_city'] = office_city
-            normalized['office_address_city_normalized'] = self.text_processor.normalize_location(office_city)
+            normalized['office_address_city_normalized'] = text_processor.normalize_location(office_city)
         
         # AI inference
         if Config.USE_AI_INFERENCE:
             ai_results = self.ai_inferencer.infer_profession_info(normalized)
-            normalized.update(ai_results)
+            normalized.update(ai_results.to_dict())
         
         # Calculate data quality scores
-        normalized['data_completeness_score'] = self._calculate_completeness_score(normalized)
-        normalized['confidence_score'] = self._calculate_confidence_score(normalized)
+        mask = self._field_mask(normalized)
+        normalized['data_completeness_score'] = self._calculate_completeness_score(normalized, mask)
+        normalized['confidence_score'] = self._calculate_confidence_score(normalized, mask)
         
         return normalized
     
-    def _find_existing_member(self, member_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Find existing member by email or name similarity."""
-        # First try exact email match
-        if member_data.get('primary_email'):
-            results = self.db.search_members({
-                'email': member_data['primary_email']
-            })
-            if results:
-                return results[0]
-        
-        # Then try name similarity
-        if member_data.get('full_name_normalized'):
-            results = self.db.search_members({
-                'name': member_data['full_name_normalized']
-            })
-            
-            # Use fuzzy matching to find close matches
-            for result in results:
-                similarity = self.text_processor.calculate_name_similarity(
-                    member_data['full_name_normalized'],
-                    result['full_name_normalized']
-                )
-                if similarity > 0.8:  # 80% similarity threshold
-                    return result
+    def _find_existing_member(self, member_data: Dict[str, Any], member_index: MemberIndex,
+                              file_index: Optional[MemberIndex] = None) -> Optional[int]:
+        """Find an existing member id by name similarity within the member's name blocks.
+        
+        Members in file_index (changed earlier in the import of a file) are matched by
+        their values there instead of member_index's.
+        """
+        name = member_data.get('full_name_normalized')
+        if not name:
+            return None
+        
+        candidates = member_index.name_candidates(name)
+        if file_index is not None:
+            candidates = [candidate for candidate in candidates if candidate[0] not in file_index.rank]
+            candidates += file_index.name_candidates(name)
+            candidates.sort(key=lambda item: file_index.rank.get(item[0]) or member_index.rank[item[0]])
+        
+        # Use fuzzy matching to find close matches (80% similarity threshold)
+        match_index = self.text_processor.find_similar_name(
+            name,
+            [candidate_name for _, candidate_name in candidates],
+            threshold=0.8
+        )
+        if match_index is not None:
+            return candidates[match_index][0]
         
         return None
     
     def _merge_member_data(self, existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
         """Merge new data with existing member data."""
-        updates = {}
-        
         # Update fields that are missing or have newer data
-        for field, new_value in new.items():
-            if field in ['id', 'created_at', 'updated_at']:
-                continue
-                
-            if new_value is None:
-                continue
-                
-            existing_value = existing.get(field)
-            
-            # Always update if existing field is empty
-            if not existing_value:
-                updates[field] = new_value
-                continue
-            
-            # For dates, keep the more recent one
-            if 'collected_date' in field:
-                if isinstance(new_value, (date, datetime)):
-                    if not existing_value or new_value > existing_value:
-                        updates[field] = new_value
-                continue
-            
-            # For confidence scores, keep higher confidence
-            if 'confidence' in field:
-                if float(new_value) > float(existing_value or 0):
-                    updates[field] = new_value
-                continue
-            
-            # For other fields, prefer longer/more complete values
-            if len(str(new_value)) > len(str(existing_value)):
-                updates[field] = new_value
-        
-        return updates
+        return {
+            field: new_value for field, new_value in new.items()
+            if new_value is not None and field not in _MERGE_SKIP_FIELDS
+            and _should_update(field, new_value, existing.get(field))
+        }
     
-    def _calculate_completeness_score(self, member_data: Dict[str, Any]) -> float:
+    def _field_mask(self, member_data: Dict[str, Any]) -> int:
+        """Pack which of the completeness fields are filled into a bit mask (bit i = _COMPLETENESS_FIELDS[i])."""
+        mask = 0
+        for bit, field in enumerate(_COMPLETENESS_FIELDS):
+            if member_data.get(field):
+                mask |= 1 << bit
+        return mask
+    
+    def _calculate_completeness_score(self, member_data: Dict[str, Any], mask: Optional[int] = None) -> float:
         """Calculate data completeness score (0.0 to 1.0)."""
-        required_fields = [
-            'full_name', 'primary_email', 'mobile_phone', 
-            'current_profession', 'school_chapter', 'batch_normalized'
-        ]
-        
-        filled_count = sum(1 for field in required_fields 
-                          if member_data.get(field))
+        if mask is None:
+            mask = self._field_mask(member_data)
         
-        return filled_count / len(required_fields)
+        return bin(mask).count('1') / len(_COMPLETENESS_FIELDS)
     
-    def _calculate_confidence_score(self, member_data: Dict[str, Any]) -> float:
+    def _calculate_confidence_score(self, member_data: Dict[str, Any], mask: Optional[int] = None) -> float:
         """Calculate overall confidence score for the record."""
+        if mask is None:
+            mask = self._field_mask(member_data)
+        
         score = 0.0
         
         # Base score from completeness
         score += member_data.get('data_completeness_score', 0) * 0.4
         
         # Bonus for verified email
-        if member_data.get('primary_email') and '@' in member_data['primary_email']:
+        if mask & _EMAIL_BIT and '@' in member_data['primary_email']:
             score += 0.2
         
         # Bonus for profession information
-        if member_data.get('current_profession'):
+        if mask & _PROFESSION_BIT:
             score += 0.2
         
         # Bonus for batch information
-        if member_data.get('batch_normalized'):
+        if mask & _BATCH_BIT:
             score += 0.1
         
         # Factor in AI inference confidence
         ai_confidence = member_data.get('inferred_profession_confidence', 0)
         score += ai_confidence * 0.1
         
-        return min(score, 1.0)  # Cap at 1.0
\ No newline at end of file
+        return min(score, 1.0)  # Cap at 1.0
@@ -3,44 +3,625 @@
 
 import sqlite3
 import logging
+import queue
+import re
+import threading
+import time
+import unicodedata
+import weakref
 from pathlib import Path
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union, Callable
 import json
+from concurrent.futures import Future
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
 
-from config import SCHEMA_PATH
+from config import SCHEMA_PATH, Config
+from text_processor import NameMatcher, TextProcessor, name_block_key
 
 logger = logging.getLogger(__name__)
 
+# Per-connection settings applied on every open
+_CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;        -- Enable foreign keys
+PRAGMA synchronous = NORMAL;     -- Corruption-safe under WAL; fsync at checkpoints only
+PRAGMA temp_store = MEMORY;      -- Sorts and temp indexes stay off disk
+PRAGMA mmap_size = 268435456;    -- Read pages through a 256 MB memory map
+PRAGMA cache_size = -65536;      -- 64 MB page cache
+PRAGMA busy_timeout = 30000;     -- Wait up to 30s on a locked database
+"""
+
+# File-format settings for a new, empty database; they have no effect once a file
+# has tables or is in WAL mode
+_SCHEMA_PRAGMAS = """
+PRAGMA page_size = 8192;          -- Shallower b-trees for the wide members rows
+PRAGMA auto_vacuum = INCREMENTAL; -- Free pages are returned to the OS by checkpoint()
+"""
+
+# SQL text is cached per column set: the same string for the same columns also hits
+# sqlite3's per-connection prepared statement cache (sized by _STATEMENT_CACHE_SIZE)
+_STATEMENT_CACHE_SIZE = 256
+
+@lru_cache(maxsize=_STATEMENT_CACHE_SIZE)
+def _insert_sql(table: str, columns: tuple) -> str:
+    """INSERT statement for the given columns, in order."""
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+@lru_cache(maxsize=_STATEMENT_CACHE_SIZE)
+def _insert_rows_sql(table: str, columns: tuple, row_count: int) -> str:
+    """Multi-row INSERT ... VALUES (...), (...) statement for row_count rows of the given columns."""
+    row = f"({', '.join('?' for _ in columns)})"
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row] * row_count)}"
+
+# Multi-row INSERTs bind every value of a chunk at once, so wide rows get smaller chunks
+_INSERT_CHUNK_ROWS = 500
+_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+def _chunk_sizes(row_count: int, chunk_rows: int) -> List[int]:
+    """Rows per INSERT: full chunks, then the remainder as powers of two.
+    
+    Splitting the tail this way bounds the distinct statements per column set
+    to about log2(chunk_rows), so repeats hit the statement caches instead of
+    each import compiling (and evicting for) a one-off tail size.
+    """
+    remainder = row_count % chunk_rows
+    return [chunk_rows] * (row_count // chunk_rows) + [
+        1 << bit for bit in reversed(range(remainder.bit_length())) if remainder >> bit & 1
+    ]
+
+def _insert_rows(conn: sqlite3.Connection, table: str, columns: tuple, rows: List[list]) -> int:
+    """Insert rows with one statement per chunk instead of one VM run per row; returns the last rowid."""
+    chunk_rows = max(1, min(_INSERT_CHUNK_ROWS, _MAX_VARIABLES // len(columns)))
+    last_id = None
+    start = 0
+    for size in _chunk_sizes(len(rows), chunk_rows):
+        chunk = rows[start:start + size]
+        start += size
+        sql = _insert_rows_sql(table, columns, size)
+        last_id = conn.execute(sql, [value for row in chunk for value in row]).lastrowid
+    return last_id
+
+@lru_cache(maxsize=_STATEMENT_CACHE_SIZE)
+def _update_sql(table: str, columns: tuple, touch: bool = False) -> str:
+    """UPDATE-by-id statement for the given columns (callers sort them); touch also sets updated_at."""
+    set_clause = ', '.join(f"{column} = ?" for column in columns)
+    if touch:
+        set_clause += ", updated_at = CURRENT_TIMESTAMP"
+    return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
+# Duplicate candidates are pairs sharing an email or a surname key, one indexed
+# self-join per key, streamed so the finder can stop at its limit. Keys shared by more
+# than _DUPLICATE_BLOCK_LIMIT members (placeholder emails, common surnames) are not
+# paired whole: their pairs grow quadratically and are mostly not duplicates.
+# CROSS JOIN keeps blocks -> m1 -> m2 in that order, each step on the key's index
+# ('+' keeps the planner off the low-selectivity is_duplicate index)
+_DUPLICATE_BLOCK_LIMIT = 200
+
+def _duplicate_candidates_sql(keys: tuple, within: str = '') -> str:
+    """Candidate pairs (id1 < id2) of non-duplicate members agreeing on every key expression.
+    
+    within optionally restricts the blocks to members matching a further condition.
+    """
+    block_columns = ', '.join(f"{key.format(m='members')} AS key{i}" for i, key in enumerate(keys))
+    block_keys = ', '.join(f"key{i}" for i in range(len(keys)))
+    m1_in_block = ' AND '.join(f"{key.format(m='m1')} = blocks.key{i}" for i, key in enumerate(keys))
+    m2_matches = ' AND '.join(f"{key.format(m='m2')} = {key.format(m='m1')}" for key in keys)
+    return f"""
+    WITH blocks AS (
+        SELECT {block_columns}
+        FROM members
+        WHERE +is_duplicate = FALSE{within and ' AND ' + within}
+        GROUP BY {block_keys}
+        HAVING COUNT(*) BETWEEN 2 AND {_DUPLICATE_BLOCK_LIMIT}
+    )
+    SELECT
+        m1.id, m1.full_name, m1.primary_email, m1.full_name_normalized,
+        m2.id, m2.full_name, m2.primary_email, m2.full_name_normalized
+    FROM blocks
+    CROSS JOIN members m1 ON {m1_in_block}
+    CROSS JOIN members m2 ON {m2_matches} AND m2.id > m1.id
+    WHERE +m1.is_duplicate = FALSE AND +m2.is_duplicate = FALSE
+    """
+
+_DUPLICATE_CANDIDATES_SQL = (
+    _duplicate_candidates_sql(('{m}.primary_email',)),
+    _duplicate_candidates_sql(('{m}.name_block_key',)),
+    # Surname blocks too big to pair whole, split by the first three letters of the name
+    _duplicate_candidates_sql(('{m}.name_block_key', 'substr({m}.full_name_normalized, 1, 3)'), f"""name_block_key IN (
+            SELECT name_block_key FROM members
+            WHERE +is_duplicate = FALSE
+            GROUP BY name_block_key
+            HAVING COUNT(*) > {_DUPLICATE_BLOCK_LIMIT}
+        )""")
+)
+
+# Writes from every thread run on one connection owned by a writer thread
+_WRITE_BATCH_SIZE = 100      # Queued writes committed together in one transaction
+_WRITER_IDLE_TIMEOUT = 5.0   # Seconds the writer waits for work before closing its connection
+
+# Seconds a dashboard aggregate is reused; a write committed through the manager, or by
+# another process, drops it sooner
+_STATS_CACHE_TTL = 60
+
+# Buffered change history is written once this many rows are waiting
+_CHANGE_LOG_FLUSH_SIZE = 500
+
+# INSERT ... RETURNING needs SQLite 3.35+; older libraries fall back to lastrowid
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+def _insert_returning_id(conn: sqlite3.Connection, sql: str, values) -> int:
+    """Run a single-row INSERT and return the new row's id."""
+    if _HAS_RETURNING:
+        return conn.execute(f"{sql.rstrip()} RETURNING id", values).fetchone()[0]
+    return conn.execute(sql, values).lastrowid
+
+_CHANGE_COLUMNS = ('member_id', 'field_name', 'old_value', 'new_value', 'change_type',
+                   'change_reason', 'source_file', 'confidence_score')
+_INSERT_CHANGE_SQL = _insert_sql('member_change_history', _CHANGE_COLUMNS)
+
+# search_members text filters -> members columns they match (all indexed in members_fts)
+# Raw columns are always populated on import; profession/interests/company *_normalized
+# columns only ever hold the same text lowercased (or nothing), so they are not searched
+_SEARCH_COLUMNS = {
+    'name': ('full_name_normalized',),
+    'profession': ('current_profession', 'inferred_profession'),
+    'interests': ('interests_hobbies', 'sports_activities'),
+    'location': ('home_address_full', 'office_address_full',
+                 'home_address_city_normalized', 'office_address_city_normalized'),
+    'chapter': ('school_chapter_normalized',),
+    'company': ('current_company',),
+}
+# get_all_members_paginated's search_term columns
+_BROWSE_COLUMNS = ('full_name_normalized', 'primary_email', 'current_profession', 'batch_normalized')
+_FTS_COLUMNS = list(dict.fromkeys(
+    [column for columns in _SEARCH_COLUMNS.values() for column in columns] + list(_BROWSE_COLUMNS)
+))
+
+# search_members filters matched as substrings through the trigram index (when enabled)
+_TRIGRAM_KEYS = ('profession', 'location', 'company')
+_TRIGRAM_COLUMNS = [column for key in _TRIGRAM_KEYS for column in _SEARCH_COLUMNS[key]]
+# The trigram tokenizer only indexes terms of at least three characters
+_TRIGRAM_MIN_LENGTH = 3
+
+def _fts_table_sql(table: str, columns: List[str], tokenize: str) -> str:
+    """External-content FTS5 index over members, kept in sync by triggers (dropped first if present)."""
+    names = ', '.join(columns)
+    new_values = ', '.join('NEW.' + column for column in columns)
+    old_values = ', '.join('OLD.' + column for column in columns)
+    return f"""
+DROP TRIGGER IF EXISTS {table}_insert;
+DROP TRIGGER IF EXISTS {table}_delete;
+DROP TRIGGER IF EXISTS {table}_update;
+DROP TABLE IF EXISTS {table};
+
+CREATE VIRTUAL TABLE {table} USING fts5(
+    {names},
+    content='members', content_rowid='id', tokenize='{tokenize}'
+);
+
+CREATE TRIGGER {table}_insert AFTER INSERT ON members BEGIN
+    INSERT INTO {table}(rowid, {names}) VALUES (NEW.id, {new_values});
+END;
+
+CREATE TRIGGER {table}_delete AFTER DELETE ON members BEGIN
+    INSERT INTO {table}({table}, rowid, {names}) VALUES ('delete', OLD.id, {old_values});
+END;
+
+CREATE TRIGGER {table}_update AFTER UPDATE OF {names} ON members BEGIN
+    INSERT INTO {table}({table}, rowid, {names}) VALUES ('delete', OLD.id, {old_values});
+    INSERT INTO {table}(rowid, {names}) VALUES (NEW.id, {new_values});
+END;
+"""
+
+# Same definitions as database_schema.sql, for databases created before they existed;
+# idx_members_search_order was the full-table predecessor of idx_members_conf_name
+_SEARCH_INDEXES_SQL = """
+DROP INDEX IF EXISTS idx_members_search_order;
+CREATE INDEX IF NOT EXISTS idx_members_conf_name ON members(confidence_score DESC, full_name) WHERE is_duplicate = FALSE;
+CREATE INDEX IF NOT EXISTS idx_members_recent ON members(updated_at DESC, full_name);
+CREATE INDEX IF NOT EXISTS idx_members_updated ON members(updated_at);
+CREATE INDEX IF NOT EXISTS idx_members_secondary_email ON members(secondary_email) WHERE secondary_email IS NOT NULL;
+"""
+
+# search_members filter conditions by parameter name, in the order they appear in the SQL
+_SEARCH_FILTERS = {
+    **{key: "(" + " OR ".join(f"m.{column} LIKE :{key} ESCAPE '\\'" for column in columns) + ")"
+       for key, columns in _SEARCH_COLUMNS.items()},
+    'batch': "m.batch_normalized LIKE :batch ESCAPE '\\'",
+    'trigram': "m.id IN (SELECT rowid FROM members_fts_tri WHERE members_fts_tri MATCH :trigram)",
+    # One indexed probe per email column; an OR of the two columns is not indexed
+    'email': ("m.id IN (SELECT id FROM members WHERE primary_email = :email"
+              " UNION ALL SELECT id FROM members WHERE secondary_email = :email)"),
+}
+
+def _any_like_filter(key: str, count: int) -> str:
+    """Condition matching any of :key_0 .. :key_{count-1} in the columns searched for key."""
+    return "(" + " OR ".join(f"m.{column} LIKE :{key}_{index} ESCAPE '\\'"
+                             for index in range(count) for column in _SEARCH_COLUMNS[key]) + ")"
+
+@lru_cache(maxsize=_STATEMENT_CACHE_SIZE)
+def _search_sql(fts: bool, filters: Tuple[str, ...], any_filters: Tuple[Tuple[str, int], ...] = ()) -> str:
+    """search_members statement with only the given filters: ranked by bm25 when :match is used.
+    
+    any_filters holds (key, term count) for text filters given a list of terms, any of which may match.
+    """
+    conditions = "".join(f" AND {_SEARCH_FILTERS[key]}" for key in filters)
+    conditions += "".join(f" AND {_any_like_filter(key, count)}" for key, count in any_filters)
+    if not fts:
+        return f"""
+SELECT m.* FROM members m
+WHERE m.is_duplicate = FALSE{conditions}
+ORDER BY m.confidence_score DESC, m.full_name
+LIMIT :limit OFFSET :offset
+"""
+    return f"""
+SELECT m.* FROM members m
+JOIN members_fts ON members_fts.rowid = m.id
+WHERE members_fts MATCH :match AND m.is_duplicate = FALSE{conditions}
+ORDER BY bm25(members_fts), m.confidence_score DESC, m.full_name
+LIMIT :limit OFFSET :offset
+"""
+
+# Word tokens as FTS5's unicode61 tokenizer sees them
+_FTS_TOKEN_RE = re.compile(r'[^\W_]+')
+# Terms with a shorter token are searched with LIKE; one-letter prefixes scan most of the index anyway
+_FTS_MIN_TOKEN_LENGTH = 2
+
+_TEXT_PROCESSOR = TextProcessor()
+
+def _search_value(key: str, value: str) -> str:
+    """Normalize a search input once: NFKC, single spaces, lowercase; names as stored in full_name_normalized."""
+    value = ' '.join(unicodedata.normalize('NFKC', value).split()).lower()
+    if key == 'name':
+        # Titles and suffixes are stripped from the stored name; keep the input if that is all it was
+        return _TEXT_PROCESSOR.normalize_name(value) or value
+    return value
+
+def _fts_filter(columns: tuple, value: str) -> Optional[str]:
+    """Build an FTS5 column-filtered prefix phrase for a search term, or None if it needs LIKE."""
+    tokens = _FTS_TOKEN_RE.findall(value.lower())
+    if not tokens or min(len(token) for token in tokens) < _FTS_MIN_TOKEN_LENGTH:
+        return None
+    return f'{{{" ".join(columns)}}} : "{" ".join(tokens)}"*'
+
+def _any_of(terms: List[str]) -> str:
+    """Combine FTS5 match expressions so that any one of them matches."""
+    if len(terms) == 1:
+        return terms[0]
+    return "(" + " OR ".join(f"({term})" for term in terms) + ")"
+
+def _like_escape(value: str) -> str:
+    """Escape LIKE wildcards (and the escape character) so value matches literally with ESCAPE '\\'."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _like_contains(value: str) -> str:
+    """LIKE pattern (ESCAPE '\\') matching value anywhere in the text."""
+    return f"%{_like_escape(value)}%"
+
+def _trigram_filter(columns: tuple, value: str) -> Optional[str]:
+    """Build a trigram FTS5 substring match (same rows as LIKE '%value%'), or None if too short."""
+    if len(value) < _TRIGRAM_MIN_LENGTH:
+        return None
+    phrase = value.replace('"', '""')
+    return f'{{{" ".join(columns)}}} : "{phrase}"'
+
+def _rows_to_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """Convert result rows to dicts while streaming the cursor, reading column names once."""
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+def _query_dicts(conn: sqlite3.Connection, sql: str, params=()) -> List[Dict[str, Any]]:
+    """Run a multi-row read and return dicts built from plain tuples (no sqlite3.Row per row)."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    return _rows_to_dicts(cursor)
+
+def _with_name_block_key(member_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Member columns plus the name_block_key derived from full_name_normalized, when it is being set."""
+    if 'full_name_normalized' not in member_data or 'name_block_key' in member_data:
+        return member_data
+    return {**member_data, 'name_block_key': name_block_key(member_data['full_name_normalized'])}
+
+def _change_row(member_id: int, field_name: str, old_value: Any, new_value: Any,
+                change_type: str, change_reason: str, source_file: str = None,
+                confidence_score: float = None) -> tuple:
+    """Parameters for _INSERT_CHANGE_SQL."""
+    return (
+        member_id, field_name, str(old_value) if old_value else None,
+        str(new_value) if new_value else None, change_type,
+        change_reason, source_file, confidence_score
+    )
+
+def _write_change_rows(db_path: Path, change_log: List[tuple]):
+    """Write a manager's unflushed change history on its own connection (at collection or exit)."""
+    if not change_log:
+        return
+    try:
+        connection = sqlite3.connect(str(db_path), timeout=30.0)
+        with connection:
+            connection.executemany(_INSERT_CHANGE_SQL, change_log)
+        connection.close()
+        del change_log[:]
+    except sqlite3.Error as e:
+        logger.error(f"Error logging {len(change_log)} changes: {e}")
+
+def _close_connection(connection: sqlite3.Connection):
+    """Close a connection after refreshing planner statistics the session showed to be stale."""
+    try:
+        connection.execute("PRAGMA optimize")  # Usually a no-op
+    except sqlite3.Error as e:
+        logger.debug(f"PRAGMA optimize skipped: {e}")
+    connection.close()
+
+def _close_pooled_connections(pool: queue.LifoQueue):
+    """Close every idle connection in a manager's reader pool."""
+    while True:
+        try:
+            connection = pool.get_nowait()
+        except queue.Empty:
+            return
+        _close_connection(connection)
+
 class DatabaseManager:
     """Manages all database operations for the SJ Professional Directory."""
     
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self.connection = None
+        # Read-only connections shared by all threads, most recently used first so the
+        # page cache stays warm; _local holds the one a thread has checked out
+        self.reader_pool = queue.LifoQueue()
+        self.pool_size = Config.DB_POOL_SIZE
+        self._local = threading.local()
+        weakref.finalize(self, _close_pooled_connections, self.reader_pool)
+        self.search_index_ready = None
+        self.trigram_index_ready = False
+        self.database_prepared = False
+        # Change history rows waiting for the next write transaction (or flush_change_log)
+        self.change_log = []
+        self.change_log_lock = threading.Lock()
+        weakref.finalize(self, _write_change_rows, self.db_path, self.change_log)
+        # Single writer thread, started on demand: queued (job, transactional, future) entries
+        self.write_queue = queue.Queue()
+        self.writer_lock = threading.Lock()
+        self.writer_thread = None
+        self.writer_connection = None
+        # Aggregate query results: name -> (expiry time, result). The generation counts
+        # invalidations, so a result computed across one is not stored; the watch connection's
+        # data_version shows commits from other connections, including other processes
+        self.stats_cache = {}
+        self.stats_cache_lock = threading.Lock()
+        self.stats_generation = 0
+        self.stats_watch_connection = None
+        self.stats_data_version = None
     
     @contextmanager
     def get_connection(self):
-        """Get database connection with proper settings and automatic cleanup."""
+        """Check out a read-only database connection from the pool, opening one if none is idle.
+        
+        Nested blocks on the same thread share the connection. When the
+        outermost block exits, anything left uncommitted is rolled back and the
+        connection goes back to the pool (or is closed if pool_size are already
+        idle). Writes go through _write instead.
+        """
+        local = self._local
+        connection = getattr(local, 'connection', None)
+        if connection is None:
+            try:
+                connection = self.reader_pool.get_nowait()
+            except queue.Empty:
+                if not self.database_prepared:
+                    self._write(self._prepare_database, transactional=False)
+                connection = self._open_connection(query_only=True)
+            local.connection = connection
+            local.depth = 0
+            local.close_pending = False
+        
+        local.depth += 1
+        try:
+            yield connection
+        finally:
+            local.depth -= 1
+            if local.depth == 0:
+                local.connection = None
+                if connection.in_transaction:
+                    connection.rollback()
+                if local.close_pending:
+                    # Deferred close_connection(): its flush waited until this read was done
+                    _close_connection(connection)
+                    self.flush_change_log()
+                elif self.reader_pool.qsize() >= self.pool_size:
+                    _close_connection(connection)
+                else:
+                    self.reader_pool.put(connection)
+    
+    def _open_connection(self, query_only: bool) -> sqlite3.Connection:
+        """Open a connection with proper settings; query_only for the pooled readers."""
         connection = sqlite3.connect(
             str(self.db_path),
             check_same_thread=False,  # Allow use across threads
-            timeout=30.0  # 30 second timeout
+            timeout=30.0,  # 30 second timeout
+            cached_statements=_STATEMENT_CACHE_SIZE  # Prepared statements kept per connection
         )
         connection.row_factory = sqlite3.Row  # Enable dict-like access
-        connection.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
+        connection.executescript(_CONNECTION_PRAGMAS)
+        if query_only:
+            connection.execute("PRAGMA query_only = ON")
+        return connection
+    
+    def _prepare_database(self, conn: sqlite3.Connection):
+        """Set the journal mode and upgrade an older schema, once per manager (on the writer connection)."""
+        if self.database_prepared:
+            return
+        # Persistent in the database file. Under WAL every reader connection, in this or
+        # another process, sees committed writes and never blocks (or is blocked by) the writer
+        journal_mode = 'WAL' if Config.DB_WAL_MODE else 'DELETE'
+        if not conn.execute("SELECT 1 FROM sqlite_master").fetchone():
+            # A new file: its page size can no longer change once it is in WAL mode
+            conn.executescript(_SCHEMA_PRAGMAS)
+        conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        self._ensure_name_block_keys(conn)
+        self.database_prepared = True
+    
+    def _write(self, job: Callable[[sqlite3.Connection], Any], transactional: bool = True) -> Any:
+        """Run job(connection) on the writer thread; returns its result or raises its error.
+        
+        Transactional jobs queued together share one BEGIN IMMEDIATE ... COMMIT,
+        each inside its own savepoint, so they must not commit or roll back
+        themselves. Other jobs (schema changes, checkpoints) run alone and
+        manage their own transactions.
+        """
+        if threading.current_thread() is self.writer_thread:
+            return job(self.writer_connection)
+        
+        future = Future()
+        with self.writer_lock:
+            self.write_queue.put((job, transactional, future))
+            if self.writer_thread is None:
+                self.writer_thread = threading.Thread(
+                    target=self._run_writer, name='sj-directory-writer', daemon=True
+                )
+                self.writer_thread.start()
+        return future.result()
+    
+    def _run_writer(self):
+        """Writer thread: apply queued writes in batches, closing the connection once idle."""
+        try:
+            connection = self._open_connection(query_only=False)
+            self.writer_connection = connection
+            self._prepare_database(connection)
+        except sqlite3.Error as e:
+            logger.error(f"Error opening writer connection: {e}")
+            with self.writer_lock:
+                self.writer_thread = None
+                while not self.write_queue.empty():
+                    self.write_queue.get_nowait()[2].set_exception(e)
+            return
         
         try:
-            yield connection
+            while True:
+                try:
+                    entry = self.write_queue.get(timeout=_WRITER_IDLE_TIMEOUT)
+                except queue.Empty:
+                    with self.writer_lock:
+                        if self.write_queue.empty():
+                            self.writer_thread = None
+                            return
+                    continue
+                
+                batch = [entry]
+                while entry[1] and len(batch) < _WRITE_BATCH_SIZE:
+                    try:
+                        entry = self.write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(entry)
+                
+                # A non-transactional job ends the batch and runs on its own after it
+                standalone = batch.pop() if not batch[-1][1] else None
+                if batch:
+                    self._commit_write_batch(connection, batch)
+                if standalone:
+                    self._run_standalone_write(connection, standalone)
         finally:
-            connection.close()
+            self.writer_connection = None
+            _close_connection(connection)
+    
+    def _commit_write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        """Run queued transactional jobs and the buffered change history in one transaction."""
+        changes = self._take_change_log()
+        total_changes = conn.total_changes
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if changes:
+                _insert_rows(conn, 'member_change_history', _CHANGE_COLUMNS, changes)
+            outcomes = []
+            for job, _, _ in batch:
+                conn.execute("SAVEPOINT write_job")
+                try:
+                    outcomes.append((job(conn), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_job")
+                    outcomes.append((None, e))
+                conn.execute("RELEASE write_job")
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self._restore_change_log(changes)
+            logger.error(f"Error committing {len(batch)} queued writes: {e}")
+            outcomes = [(None, e)] * len(batch)
+        
+        if conn.total_changes != total_changes:
+            self.invalidate_stats_cache()
+        for (_, _, future), (result, error) in zip(batch, outcomes):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+    
+    def _run_standalone_write(self, conn: sqlite3.Connection, entry: tuple):
+        """Run a non-transactional job outside any batch."""
+        job, _, future = entry
+        total_changes = conn.total_changes
+        try:
+            result = job(conn)
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            result, error = None, e
+        else:
+            error = None
+        
+        if conn.total_changes != total_changes:
+            self.invalidate_stats_cache()
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+    
+    def _ensure_name_block_keys(self, conn: sqlite3.Connection):
+        """Add the duplicate-blocking key column and indexes to databases created before they existed."""
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(members)")}
+            if not columns:
+                return  # No schema yet; create_database adds them
+            
+            if 'name_block_key' not in columns:
+                conn.execute("ALTER TABLE members ADD COLUMN name_block_key TEXT")
+                rows = conn.execute("SELECT id, full_name_normalized FROM members").fetchall()
+                conn.executemany(
+                    "UPDATE members SET name_block_key = ? WHERE id = ?",
+                    [(name_block_key(row[1]), row[0]) for row in rows]
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_members_block_key ON members(name_block_key)")
+                logger.info(f"Added name block keys for {len(rows)} members")
+            
+            # The name prefix is only looked up within a surname block
+            conn.execute("DROP INDEX IF EXISTS idx_members_name_prefix")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_members_block_prefix "
+                "ON members(name_block_key, substr(full_name_normalized, 1, 3))"
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.warning(f"Could not add name block keys: {e}")
     
     def close_connection(self):
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Close idle pooled connections, and this thread's once any block using it has exited."""
+        if getattr(self._local, 'connection', None) is not None:
+            self._local.close_pending = True
+        else:
+            self.flush_change_log()
+        _close_pooled_connections(self.reader_pool)
+        with self.stats_cache_lock:
+            if self.stats_watch_connection is not None:
+                self.stats_watch_connection.close()
+                self.stats_watch_connection = None
+                self.stats_data_version = None  # Versions are per connection
     
     def create_database(self):
         """Create database from schema file."""
@@ -50,28 +631,55 @@ class DatabaseManager:
         with open(SCHEMA_PATH, 'r') as f:
             schema_sql = f.read()
         
-        with self.get_connection() as conn:
-            try:
-                # Execute schema using executescript for multiple statements
-                conn.executescript(schema_sql)
-                conn.commit()
-                logger.info("Database schema created successfully")
-            except Exception as e:
+        self._write(lambda conn: self._create_schema(conn, schema_sql), transactional=False)
+    
+    def _create_schema(self, conn: sqlite3.Connection, schema_sql: str):
+        """Apply the schema script on the writer connection, as a single transaction."""
+        try:
+            # One transaction for the whole script: all or nothing, and one commit
+            conn.executescript(f"BEGIN;\n{schema_sql}\nCOMMIT;")
+            logger.info("Database schema created successfully")
+        except Exception as e:
+            if conn.in_transaction:
                 conn.rollback()
-                logger.error(f"Error creating database schema: {e}")
-                # Try alternative method - split by semicolon
-                try:
-                    logger.info("Trying alternative method...")
-                    statements = [s.strip() for s in schema_sql.split(';') if s.strip()]
-                    for statement in statements:
-                        if statement and not statement.startswith('--'):
-                            conn.execute(statement + ';')
-                    conn.commit()
-                    logger.info("Database schema created successfully (alternative method)")
-                except Exception as e2:
-                    conn.rollback()
-                    logger.error(f"Alternative method also failed: {e2}")
-                    raise e
+            logger.error(f"Error creating database schema: {e}")
+            raise
+        
+        self.search_index_ready = self._ensure_search_schema(conn)
+        
+        # Seed planner statistics, bounded so it stays cheap on large imports
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("PRAGMA optimize")
+    
+    def _ensure_search_schema(self, conn: sqlite3.Connection) -> bool:
+        """Add search indexes missing from older databases; False if FTS5 is unavailable."""
+        try:
+            conn.executescript(_SEARCH_INDEXES_SQL)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not create search indexes: {e}")
+        
+        if not self._ensure_fts_table(conn, 'members_fts', _FTS_COLUMNS, 'unicode61 remove_diacritics 2'):
+            logger.warning("Full-text search unavailable, using LIKE search")
+            return False
+        
+        if Config.SEARCH_TRIGRAM:
+            self.trigram_index_ready = self._ensure_fts_table(conn, 'members_fts_tri', _TRIGRAM_COLUMNS, 'trigram')
+        return True
+    
+    def _ensure_fts_table(self, conn: sqlite3.Connection, table: str, columns: List[str], tokenize: str) -> bool:
+        """Create (or recreate, if its columns changed) an FTS5 index over members; False on failure."""
+        try:
+            indexed = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            if indexed != columns:
+                conn.executescript(_fts_table_sql(table, columns, tokenize))
+                conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+                conn.commit()
+                logger.info(f"Full-text search index {table} created")
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.warning(f"Could not create search index {table}: {e}")
+            return False
     
     def test_connection(self) -> bool:
         """Test database connection."""
@@ -85,53 +693,104 @@ class DatabaseManager:
     
     def insert_member(self, member_data: Dict[str, Any]) -> int:
         """Insert a new member record."""
-        with self.get_connection() as conn:
-            try:
-                # Prepare insert statement
-                columns = list(member_data.keys())
-                placeholders = ['?' for _ in columns]
-                values = list(member_data.values())
-                
-                sql = f"""
-                INSERT INTO members ({', '.join(columns)})
-                VALUES ({', '.join(placeholders)})
-                """
-                
-                cursor = conn.execute(sql, values)
-                member_id = cursor.lastrowid
-                conn.commit()
-                logger.debug(f"Inserted member with ID: {member_id}")
-                return member_id
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"Error inserting member: {e}")
-                raise
+        return self.insert_members([member_data])[0]
+    
+    def insert_members(self, members: List[Dict[str, Any]]) -> List[int]:
+        """Insert new member records in a single transaction; returns their IDs in order."""
+        if not members:
+            return []
+        
+        try:
+            member_ids = self._write(lambda conn: self._insert_member_rows(conn, members))
+            logger.debug(f"Inserted {len(member_ids)} members")
+            return member_ids
+        except Exception as e:
+            logger.error(f"Error inserting members: {e}")
+            raise
+    
+    def _insert_member_rows(self, conn: sqlite3.Connection, members: List[Dict[str, Any]]) -> List[int]:
+        """Insert member records in the caller's transaction; returns their IDs in order."""
+        member_ids = []
+        # One INSERT per run of consecutive records sharing the same columns keeps insert order;
+        # columns are compared sorted, so key order from different parse paths doesn't split a run
+        members = [_with_name_block_key(member) for member in members]
+        for columns, group in groupby(members, key=lambda member: tuple(sorted(member))):
+            rows = [[member[column] for column in columns] for member in group]
+            sql = _insert_sql('members', columns)
+            if len(rows) == 1:
+                member_ids.append(_insert_returning_id(conn, sql, rows[0]))
+                continue
+            
+            # Rows get consecutive rowids while the write lock is held
+            last_id = _insert_rows(conn, 'members', columns, rows)
+            member_ids.extend(range(last_id - len(rows) + 1, last_id + 1))
+        return member_ids
     
     def update_member(self, member_id: int, updates: Dict[str, Any]) -> bool:
         """Update an existing member record."""
         if not updates:
             return True
         
+        updates = _with_name_block_key(updates)
+        columns = tuple(sorted(updates))
+        sql = _update_sql('members', columns, touch=True)
+        values = [updates[column] for column in columns] + [member_id]
+        try:
+            updated = self._write(lambda conn: conn.execute(sql, values).rowcount)
+            logger.debug(f"Updated member {member_id}: {updated} rows affected")
+            return updated > 0
+        except Exception as e:
+            logger.error(f"Error updating member {member_id}: {e}")
+            raise
+    
+    def get_member_keys(self, since_id: int = 0) -> List[Dict[str, Any]]:
+        """Get the identifying fields of non-duplicate members with id above since_id."""
         with self.get_connection() as conn:
-            try:
-                # Build SET clause
-                set_clauses = [f"{col} = ?" for col in updates.keys()]
-                values = list(updates.values()) + [member_id]
-                
-                sql = f"""
-                UPDATE members 
-                SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """
-                
-                cursor = conn.execute(sql, values)
-                conn.commit()
-                logger.debug(f"Updated member {member_id}: {cursor.rowcount} rows affected")
-                return cursor.rowcount > 0
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"Error updating member {member_id}: {e}")
-                raise
+            sql = """
+            SELECT id, primary_email, secondary_email, full_name_normalized, full_name, confidence_score
+            FROM members
+            WHERE is_duplicate = FALSE AND id > ?
+            ORDER BY id
+            """
+            return _query_dicts(conn, sql, (since_id,))
+    
+    def get_members_by_ids(self, member_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get full member records for the given ids, keyed by id."""
+        members = {}
+        with self.get_connection() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(member_ids), 500):
+                chunk = member_ids[start:start + 500]
+                placeholders = ', '.join('?' for _ in chunk)
+                for member in _query_dicts(conn, f"SELECT * FROM members WHERE id IN ({placeholders})", chunk):
+                    members[member['id']] = member
+        return members
+    
+    def bulk_write_members(self, new_members: List[Dict[str, Any]],
+                           member_updates: Dict[int, Dict[str, Any]]) -> int:
+        """Insert new member records and apply updates in a single transaction."""
+        if not new_members and not member_updates:
+            return 0
+        
+        def write(conn: sqlite3.Connection) -> int:
+            inserted = len(self._insert_member_rows(conn, new_members))
+            # Updates setting the same columns share one statement, run with executemany
+            shapes = {}
+            for member_id, updates in member_updates.items():
+                updates = _with_name_block_key(updates)
+                columns = tuple(sorted(updates))
+                shapes.setdefault(columns, []).append([updates[column] for column in columns] + [member_id])
+            for columns, rows in shapes.items():
+                conn.executemany(_update_sql('members', columns, touch=True), rows)
+            return inserted
+        
+        try:
+            inserted = self._write(write)
+            logger.debug(f"Inserted {inserted} and updated {len(member_updates)} members")
+            return inserted
+        except Exception as e:
+            logger.error(f"Error writing member batch: {e}")
+            raise
     
     def get_member_by_id(self, member_id: int) -> Optional[Dict[str, Any]]:
         """Get member by ID."""
@@ -143,200 +802,239 @@ class DatabaseManager:
             return dict(row) if row else None
     
     def search_members(self, query_params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Search members with various filters."""
+        """Search members with various filters; 'limit' (at most 100) and 'offset' page through results."""
         with self.get_connection() as conn:
-            where_clauses = ["is_duplicate = FALSE"]
-            params = []
-            
-            # Build dynamic WHERE clause
-            if query_params.get('name'):
-                where_clauses.append("full_name_normalized LIKE ?")
-                params.append(f"%{query_params['name'].lower()}%")
+            if self.search_index_ready is None:
+                self.search_index_ready = self._write(self._ensure_search_schema, transactional=False)
             
-            if query_params.get('profession'):
-                where_clauses.append("""
-                    (current_profession LIKE ? 
-                     OR current_profession_normalized LIKE ? 
-                     OR inferred_profession LIKE ?)
-                """)
-                prof = f"%{query_params['profession'].lower()}%"
-                params.extend([prof, prof, prof])
+            # Only the filters in use appear in the SQL; each set of them has one cached statement
+            params = {}
+            match_terms = []
+            trigram_terms = []
+            any_filters = []
             
-            if query_params.get('interests'):
-                where_clauses.append("""
-                    (interests_hobbies LIKE ?
-                     OR interests_hobbies_normalized LIKE ?
-                     OR sports_activities LIKE ?
-                     OR sports_activities_normalized LIKE ?)
-                """)
-                interest = f"%{query_params['interests'].lower()}%"
-                params.extend([interest, interest, interest, interest])
-            
-            if query_params.get('location'):
-                where_clauses.append("""
-                    (home_address_full LIKE ?
-                     OR office_address_full LIKE ?
-                     OR home_address_city_normalized LIKE ? 
-                     OR office_address_city_normalized LIKE ?)
-                """)
-                loc = f"%{query_params['location'].lower()}%"
-                params.extend([loc, loc, loc, loc])
+            # Text filters use an FTS index when available, LIKE otherwise; a list of terms matches any of them
+            for key, columns in _SEARCH_COLUMNS.items():
+                value = query_params.get(key)
+                values = value if isinstance(value, (list, tuple)) else [value]
+                terms = list(dict.fromkeys(filter(None, (_search_value(key, term) for term in values if term))))
+                if not terms:
+                    continue
+                
+                if self.trigram_index_ready and key in _TRIGRAM_KEYS:
+                    trigram_filters = [_trigram_filter(columns, term) for term in terms]
+                    if all(trigram_filters):
+                        trigram_terms.append(_any_of(trigram_filters))
+                        continue
+                
+                fts_filters = [_fts_filter(columns, term) for term in terms] if self.search_index_ready else [None]
+                if all(fts_filters):
+                    match_terms.append(_any_of(fts_filters))
+                elif len(terms) == 1:
+                    params[key] = _like_contains(terms[0])
+                else:
+                    any_filters.append((key, len(terms)))
+                    params.update((f"{key}_{index}", _like_contains(term)) for index, term in enumerate(terms))
             
             if query_params.get('batch'):
-                where_clauses.append("batch_normalized LIKE ?")
-                params.append(f"%{query_params['batch']}%")
-            
-            if query_params.get('chapter'):
-                where_clauses.append("school_chapter_normalized LIKE ?")
-                params.append(f"%{query_params['chapter'].lower()}%")
-            
-            if query_params.get('company'):
-                where_clauses.append("""
-                    (current_company LIKE ?
-                     OR current_company_normalized LIKE ?)
-                """)
-                comp = f"%{query_params['company'].lower()}%"
-                params.extend([comp, comp])
-            
+                params['batch'] = _like_contains(query_params['batch'])
+            if trigram_terms:
+                params['trigram'] = " AND ".join(trigram_terms)
             if query_params.get('email'):
-                where_clauses.append("(primary_email = ? OR secondary_email = ?)")
-                params.extend([query_params['email'], query_params['email']])
+                params['email'] = query_params['email']
             
-            sql = f"""
-            SELECT * FROM members 
-            WHERE {' AND '.join(where_clauses)}
-            ORDER BY confidence_score DESC, full_name
-            LIMIT 100
-            """
+            sql = _search_sql(bool(match_terms), tuple(key for key in _SEARCH_FILTERS if key in params),
+                              tuple(any_filters))
+            if match_terms:
+                params['match'] = " AND ".join(match_terms)
+            params['limit'] = min(int(query_params.get('limit') or 100), 100)
+            params['offset'] = int(query_params.get('offset') or 0)
             
-            # Debug output for Streamlit
-            try:
-                import streamlit as st
-                st.info(f"🔍 SQL: {sql}")
-                st.info(f"🔍 Params: {params}")
-                st.info(f"🔍 Where clauses: {where_clauses}")
-            except:
-                pass  # Not in Streamlit context
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Search SQL: %s params: %s", sql, params)
             
-            cursor = conn.execute(sql, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return _query_dicts(conn, sql, params)
+    
+    def _browse_filters(self, search_term: Optional[str]) -> Tuple[List[str], List[Any]]:
+        """WHERE conditions and parameters for a member listing's search term (FTS, else LIKE)."""
+        where_clauses = []
+        params = []
+        
+        if self.search_index_ready is None:
+            self.search_index_ready = self._write(self._ensure_search_schema, transactional=False)
+        fts_term = _fts_filter(_BROWSE_COLUMNS, search_term) if search_term and self.search_index_ready else None
+        
+        if fts_term:
+            where_clauses.append("id IN (SELECT rowid FROM members_fts WHERE members_fts MATCH ?)")
+            params.append(fts_term)
+        elif search_term:
+            where_clauses.append("""
+                (full_name_normalized LIKE ? ESCAPE '\\'
+                 OR primary_email LIKE ? ESCAPE '\\'
+                 OR current_profession LIKE ? ESCAPE '\\'
+                 OR batch_normalized LIKE ? ESCAPE '\\')
+            """)
+            search_pattern = _like_contains(search_term.lower())
+            params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
+        
+        return where_clauses, params
+    
+    def get_all_members_after(self, cursor: Optional[Tuple[str, int]] = None, per_page: int = 50,
+                              search_term: str = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """Get one page of members, most recently updated first, by keyset instead of OFFSET.
+        
+        Pass the returned cursor to get the next page; it is None after the last page.
+        Each page costs the same however deep it is, unlike get_all_members_paginated.
+        """
+        where_clauses, params = self._browse_filters(search_term)
+        if cursor is not None:
+            where_clauses.append("(updated_at, id) < (?, ?)")
+            params.extend(cursor)
+        where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+        
+        # Walks idx_members_updated backwards: (updated_at, rowid) descending
+        sql = f"""
+        SELECT * FROM members 
+        {where_clause}
+        ORDER BY updated_at DESC, id DESC 
+        LIMIT ?
+        """
+        
+        with self.get_connection() as conn:
+            members = _query_dicts(conn, sql, params + [per_page])
+        
+        next_cursor = None
+        if len(members) == per_page:
+            next_cursor = (members[-1]['updated_at'], members[-1]['id'])
+        return members, next_cursor
     
     def get_all_members_paginated(self, page: int = 1, per_page: int = 50, 
                                   search_term: str = None, include_inactive: bool = False) -> tuple:
-        """Get all members with pagination and optional search."""
+        """Get all members with pagination and optional search; deep pages are cheaper with get_all_members_after."""
         with self.get_connection() as conn:
             offset = (page - 1) * per_page
             
-            # Base query conditions
-            where_clauses = []
-            params = []
-            
             # Removed is_active filter - show all members regardless of status
-            
-            if search_term:
-                where_clauses.append("""
-                    (full_name_normalized LIKE ? 
-                     OR primary_email LIKE ? 
-                     OR current_profession LIKE ?
-                     OR batch_normalized LIKE ?)
-                """)
-                search_pattern = f"%{search_term.lower()}%"
-                params.extend([search_pattern, search_pattern, search_pattern, search_pattern])
+            where_clauses, params = self._browse_filters(search_term)
             
             where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
             
-            # Get total count
             count_sql = f"SELECT COUNT(*) FROM members {where_clause}"
-            cursor = conn.execute(count_sql, params)
-            total_count = cursor.fetchone()[0]
             
-            # Get paginated results
+            # The total rides along as an uncorrelated subquery, evaluated once; unlike
+            # COUNT(*) OVER () it leaves the page free to walk idx_members_recent under LIMIT
             data_sql = f"""
-            SELECT * FROM members 
+            SELECT *, ({count_sql}) AS total_count FROM members 
             {where_clause}
             ORDER BY updated_at DESC, full_name 
             LIMIT ? OFFSET ?
             """
             
-            cursor = conn.execute(data_sql, params + [per_page, offset])
-            members = [dict(row) for row in cursor.fetchall()]
+            members = _query_dicts(conn, data_sql, params + params + [per_page, offset])
+            
+            if members:
+                total_count = members[0]['total_count']
+                for member in members:
+                    del member['total_count']
+            else:
+                # A page past the end has no rows to carry the total
+                total_count = conn.execute(count_sql, params).fetchone()[0]
             
             return members, total_count
     
     def delete_member(self, member_id: int) -> bool:
         """Soft delete a member by setting is_active to FALSE."""
-        with self.get_connection() as conn:
-            try:
-                sql = """
-                UPDATE members 
-                SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """
-                
-                cursor = conn.execute(sql, (member_id,))
-                conn.commit()
+        try:
+            sql = """
+            UPDATE members 
+            SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """
+            
+            updated = self._write(lambda conn: conn.execute(sql, (member_id,)).rowcount)
+            
+            if updated > 0:
+                logger.info(f"Soft deleted member {member_id}")
+                return True
+            else:
+                logger.warning(f"Member {member_id} not found for deletion")
+                return False
                 
-                if cursor.rowcount > 0:
-                    logger.info(f"Soft deleted member {member_id}")
-                    return True
-                else:
-                    logger.warning(f"Member {member_id} not found for deletion")
-                    return False
-                    
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"Error deleting member {member_id}: {e}")
-                raise
+        except Exception as e:
+            logger.error(f"Error deleting member {member_id}: {e}")
+            raise
     
     def restore_member(self, member_id: int) -> bool:
         """Restore a soft-deleted member by setting is_active to TRUE."""
-        with self.get_connection() as conn:
-            try:
-                sql = """
-                UPDATE members 
-                SET is_active = TRUE, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                """
-                
-                cursor = conn.execute(sql, (member_id,))
-                conn.commit()
+        try:
+            sql = """
+            UPDATE members 
+            SET is_active = TRUE, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """
+            
+            updated = self._write(lambda conn: conn.execute(sql, (member_id,)).rowcount)
+            
+            if updated > 0:
+                logger.info(f"Restored member {member_id}")
+                return True
+            else:
+                logger.warning(f"Member {member_id} not found for restoration")
+                return False
                 
-                if cursor.rowcount > 0:
-                    logger.info(f"Restored member {member_id}")
-                    return True
-                else:
-                    logger.warning(f"Member {member_id} not found for restoration")
-                    return False
-                    
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"Error restoring member {member_id}: {e}")
-                raise
+        except Exception as e:
+            logger.error(f"Error restoring member {member_id}: {e}")
+            raise
     
     def log_change(self, member_id: int, field_name: str, old_value: Any, 
                    new_value: Any, change_type: str, change_reason: str,
-                   source_file: str = None, confidence_score: float = None):
-        """Log a change to member data."""
-        with self.get_connection() as conn:
-            sql = """
-            INSERT INTO member_change_history 
-            (member_id, field_name, old_value, new_value, change_type, 
-             change_reason, source_file, confidence_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            try:
-                conn.execute(sql, (
-                    member_id, field_name, str(old_value) if old_value else None,
-                    str(new_value) if new_value else None, change_type,
-                    change_reason, source_file, confidence_score
-                ))
-                conn.commit()
-            except Exception as e:
-                logger.error(f"Error logging change: {e}")
+                   source_file: str = None, confidence_score: float = None,
+                   conn: sqlite3.Connection = None):
+        """Log a change to member data (written with the writer's next transaction or flush).
+        
+        Inside a write job, pass the job's conn to write the row in that job's transaction.
+        """
+        row = _change_row(member_id, field_name, old_value, new_value,
+                          change_type, change_reason, source_file, confidence_score)
+        if conn is not None:
+            conn.execute(_INSERT_CHANGE_SQL, row)
+            return
+        
+        with self.change_log_lock:
+            self.change_log.append(row)
+            pending = len(self.change_log)
+        
+        if pending >= _CHANGE_LOG_FLUSH_SIZE:
+            self.flush_change_log()
+    
+    def flush_change_log(self):
+        """Write buffered change history rows now."""
+        with self.change_log_lock:
+            if not self.change_log:
+                return
+        
+        try:
+            # Every writer transaction includes the buffered rows; an empty job commits them
+            self._write(lambda conn: None)
+        except Exception as e:
+            logger.error(f"Error flushing change history: {e}")
+    
+    def _take_change_log(self) -> List[tuple]:
+        """Remove and return the buffered change history rows."""
+        with self.change_log_lock:
+            rows = self.change_log[:]
+            del self.change_log[:]
+        return rows
+    
+    def _restore_change_log(self, rows: List[tuple]):
+        """Put back rows whose transaction rolled back, ahead of newer ones."""
+        if rows:
+            with self.change_log_lock:
+                self.change_log[:0] = rows
     
     def get_member_history(self, member_id: int) -> List[Dict[str, Any]]:
         """Get change history for a member."""
+        self.flush_change_log()
         with self.get_connection() as conn:
             sql = """
             SELECT * FROM member_change_history 
@@ -344,122 +1042,112 @@ class DatabaseManager:
             ORDER BY changed_at DESC
             """
             
-            cursor = conn.execute(sql, (member_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            return _query_dicts(conn, sql, (member_id,))
     
     def find_potential_duplicates(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Find potential duplicate members."""
+        """Find potential duplicate members: identical emails, or similar names sharing a block.
+        
+        Candidate pairs come from indexed joins on primary_email and
+        name_block_key (Soundex of the surname) rather than comparing every
+        pair. Keys shared by more than _DUPLICATE_BLOCK_LIMIT members are
+        skipped, except that oversized surname blocks are paired within the
+        first three letters of the name. Names are then kept if one contains
+        the other or they score as similar. Pairs are returned by key (email
+        matches first) and then in join order, as they are found.
+        """
         with self.get_connection() as conn:
-            # Find members with similar names or identical emails
-            sql = """
-            SELECT 
-                m1.id as id1, m1.full_name as name1, m1.primary_email as email1,
-                m2.id as id2, m2.full_name as name2, m2.primary_email as email2,
-                CASE 
-                    WHEN m1.primary_email = m2.primary_email THEN 'email_match'
-                    ELSE 'name_similarity'
-                END as match_type
-            FROM members m1
-            JOIN members m2 ON m1.id < m2.id
-            WHERE m1.is_duplicate = FALSE AND m2.is_duplicate = FALSE
-            AND (
-                m1.primary_email = m2.primary_email
-                OR (
-                    m1.full_name_normalized LIKE '%' || m2.full_name_normalized || '%'
-                    OR m2.full_name_normalized LIKE '%' || m1.full_name_normalized || '%'
-                )
-            )
-            LIMIT ?
-            """
+            duplicates = []
+            found = set()
+            matcher = NameMatcher()
+            for sql in _DUPLICATE_CANDIDATES_SQL:
+                cursor = conn.cursor()
+                cursor.row_factory = None  # Plain tuples; this can stream many candidate pairs
+                try:
+                    for id1, name1, email1, norm1, id2, name2, email2, norm2 in cursor.execute(sql):
+                        # Pairs found under an earlier key; rejected ones would be rejected again
+                        if (id1, id2) in found:
+                            continue
+                        if email1 and email1 == email2:
+                            match_type = 'email_match'
+                        elif norm1 and norm2 and (norm1 in norm2 or norm2 in norm1 or matcher.similar(norm1, norm2)):
+                            match_type = 'name_similarity'
+                        else:
+                            continue
+                        
+                        found.add((id1, id2))
+                        duplicates.append({
+                            'id1': id1, 'name1': name1, 'email1': email1,
+                            'id2': id2, 'name2': name2, 'email2': email2,
+                            'match_type': match_type
+                        })
+                        if len(duplicates) >= limit:
+                            return duplicates
+                finally:
+                    # Early returns leave the statement unfinished; don't keep its read snapshot
+                    cursor.close()
             
-            cursor = conn.execute(sql, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            return duplicates
     
     def merge_duplicates(self, primary_id: int, duplicate_ids: List[int]) -> Dict[str, Any]:
         """Merge duplicate member records."""
-        with self.get_connection() as conn:
-            try:
-                # Start transaction
-                conn.execute("BEGIN TRANSACTION")
-                
-                # Get primary record
-                primary = self.get_member_by_id(primary_id)
-                if not primary:
-                    raise ValueError(f"Primary member {primary_id} not found")
-                
-                merged_count = 0
-                
-                for dup_id in duplicate_ids:
-                    # Mark duplicate as merged
-                    conn.execute("""
-                        UPDATE members 
-                        SET is_duplicate = TRUE, primary_record_id = ?, 
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    """, (primary_id, dup_id))
-                    
-                    # Log the merge
-                    self.log_change(
-                        dup_id, 'record_status', 'active', 'merged',
-                        'MERGE', 'duplicate_merge'
-                    )
-                    
-                    merged_count += 1
-                
-                conn.commit()
-                logger.info(f"Merged {merged_count} duplicates into member {primary_id}")
-                
-                return {
-                    'primary_id': primary_id,
-                    'merged_count': merged_count,
-                    'merged_ids': duplicate_ids
-                }
-                
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"Error merging duplicates: {e}")
-                raise
-    
-    def get_system_stats(self) -> Dict[str, Any]:
-        """Get system statistics."""
-        with self.get_connection() as conn:
-            stats = {}
-            
-            # Basic counts
-            cursor = conn.execute("SELECT COUNT(*) FROM members")
-            stats['total_members'] = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT COUNT(*) FROM members WHERE is_duplicate = TRUE")
-            stats['duplicates'] = cursor.fetchone()[0]
+        def merge(conn: sqlite3.Connection):
+            # Get primary record
+            if not conn.execute("SELECT 1 FROM members WHERE id = ?", (primary_id,)).fetchone():
+                raise ValueError(f"Primary member {primary_id} not found")
             
-            cursor = conn.execute("""
-                SELECT COUNT(*) FROM members 
-                WHERE primary_email IS NOT NULL
-            """)
-            stats['members_with_email'] = cursor.fetchone()[0]
-            
-            cursor = conn.execute("""
-                SELECT COUNT(*) FROM members 
-                WHERE current_profession IS NOT NULL
-            """)
-            stats['members_with_profession'] = cursor.fetchone()[0]
+            # Mark duplicates as merged
+            conn.executemany("""
+                UPDATE members 
+                SET is_duplicate = TRUE, primary_record_id = ?, 
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [(primary_id, dup_id) for dup_id in duplicate_ids])
             
-            # Data quality
-            cursor = conn.execute("""
-                SELECT AVG(confidence_score) FROM members 
-                WHERE confidence_score IS NOT NULL
-            """)
-            result = cursor.fetchone()[0]
-            stats['avg_confidence'] = round(result, 2) if result else 0
+            # Log the merges in the same transaction
+            _insert_rows(conn, 'member_change_history', _CHANGE_COLUMNS, [
+                _change_row(dup_id, 'record_status', 'active', 'merged', 'MERGE', 'duplicate_merge')
+                for dup_id in duplicate_ids
+            ])
+        
+        try:
+            self._write(merge)
+            merged_count = len(duplicate_ids)
+            logger.info(f"Merged {merged_count} duplicates into member {primary_id}")
             
-            # Recent activity
+            return {
+                'primary_id': primary_id,
+                'merged_count': merged_count,
+                'merged_ids': duplicate_ids
+            }
+        
+        except Exception as e:
+            logger.error(f"Error merging duplicates: {e}")
+            raise
+    
+    def get_system_stats(self) -> Dict[str, Any]:
+        """Get system statistics (cached, see _cached_stats)."""
+        totals = self._member_totals()
+        # Recent activity includes changes still buffered
+        self.flush_change_log()
+        recent = self._cached_stats('recent_changes', self._query_recent_changes)
+        
+        avg_confidence = totals['avg_confidence']
+        return {
+            'total_members': totals['total_records'],
+            'duplicates': totals['duplicates'],
+            'members_with_email': totals['with_email'],
+            'members_with_profession': totals['with_profession'],
+            'avg_confidence': round(avg_confidence, 2) if avg_confidence else 0,
+            'changes_last_week': recent['changes_last_week']
+        }
+    
+    def _query_recent_changes(self) -> Dict[str, Any]:
+        with self.get_connection() as conn:
             cursor = conn.execute("""
                 SELECT COUNT(*) FROM member_change_history 
                 WHERE changed_at >= datetime('now', '-7 days')
             """)
-            stats['changes_last_week'] = cursor.fetchone()[0]
-            
-            return stats
+            return {'changes_last_week': cursor.fetchone()[0]}
     
     def get_import_stats(self) -> List[Dict[str, Any]]:
         """Get import batch statistics."""
@@ -470,19 +1158,40 @@ class DatabaseManager:
             LIMIT 10
             """
             
-            cursor = conn.execute(sql)
-            return [dict(row) for row in cursor.fetchall()]
+            return _query_dicts(conn, sql)
+    
+    def find_import_batches_by_file(self, file_name: str) -> List[Dict[str, Any]]:
+        """Get import batches whose source files include a path or file name."""
+        with self.get_connection() as conn:
+            sql = """
+            SELECT * FROM import_batches
+            WHERE EXISTS (
+                SELECT 1 FROM json_each(import_batches.source_files)
+                WHERE value = ? OR value LIKE ? ESCAPE '\\' OR value LIKE ? ESCAPE '\\'
+            )
+            ORDER BY import_date DESC
+            """
+            
+            escaped = _like_escape(file_name)
+            return _query_dicts(conn, sql, (file_name, '%/' + escaped, '%\\\\' + escaped))
     
     def get_data_quality_summary(self) -> Dict[str, Any]:
-        """Get data quality summary."""
+        """Get data quality summary (cached, see _cached_stats)."""
+        return self._member_totals()
+    
+    def _member_totals(self) -> Dict[str, Any]:
+        """Counts and averages over members, from one scan shared by the stats and quality summary."""
+        return self._cached_stats('member_totals', self._query_member_totals)
+    
+    def _query_member_totals(self) -> Dict[str, Any]:
         with self.get_connection() as conn:
             # This would typically use the data_quality_summary view from schema
             sql = """
             SELECT 
                 COUNT(*) as total_records,
-                COUNT(CASE WHEN primary_email IS NOT NULL THEN 1 END) as with_email,
-                COUNT(CASE WHEN mobile_phone IS NOT NULL THEN 1 END) as with_mobile,
-                COUNT(CASE WHEN current_profession IS NOT NULL THEN 1 END) as with_profession,
+                COUNT(primary_email) as with_email,
+                COUNT(mobile_phone) as with_mobile,
+                COUNT(current_profession) as with_profession,
                 COUNT(*) as total_records_all,
                 COUNT(CASE WHEN is_duplicate = TRUE THEN 1 END) as duplicates,
                 AVG(confidence_score) as avg_confidence,
@@ -494,43 +1203,89 @@ class DatabaseManager:
             row = cursor.fetchone()
             return dict(row) if row else {}
     
+    def _cached_stats(self, name: str, query) -> Dict[str, Any]:
+        """Result of an aggregate query, reused for _STATS_CACHE_TTL seconds or until the next write."""
+        now = time.monotonic()
+        with self.stats_cache_lock:
+            self._check_data_version()
+            cached = self.stats_cache.get(name)
+            generation = self.stats_generation
+        if cached and cached[0] > now:
+            return dict(cached[1])
+        
+        result = query()
+        with self.stats_cache_lock:
+            # A write committed while the query ran may be missing from its result
+            if self.stats_generation == generation:
+                self.stats_cache[name] = (now + _STATS_CACHE_TTL, result)
+        return dict(result)
+    
+    def _check_data_version(self):
+        """Drop cached aggregates if another connection committed since the last check; caller holds the lock."""
+        try:
+            if self.stats_watch_connection is None:
+                self.stats_watch_connection = self._open_connection(query_only=True)
+            data_version = self.stats_watch_connection.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.debug(f"Database change check skipped: {e}")
+            data_version = None
+        
+        if data_version is None or data_version != self.stats_data_version:
+            self.stats_cache.clear()
+            self.stats_generation += 1
+            self.stats_data_version = data_version
+    
+    def invalidate_stats_cache(self):
+        """Drop cached aggregates, e.g. after writing to the database outside this manager."""
+        with self.stats_cache_lock:
+            self.stats_cache.clear()
+            self.stats_generation += 1
+    
     def get_potential_duplicates(self) -> List[Dict[str, Any]]:
         """Get potential duplicates for manual review."""
         return self.find_potential_duplicates(50)
     
-    def create_import_batch(self, batch_name: str, source_files: List[str]) -> int:
-        """Create a new import batch record."""
-        with self.get_connection() as conn:
-            sql = """
-            INSERT INTO import_batches (batch_name, source_files, import_type)
-            VALUES (?, ?, 'initial')
-            """
-            
-            cursor = conn.execute(sql, (batch_name, json.dumps(source_files)))
-            batch_id = cursor.lastrowid
-            conn.commit()
-            return batch_id
+    def create_import_batch(self, batch_name: str, source_files: Union[List[str], str]) -> int:
+        """Create a new import batch record; source_files may already be a JSON array string."""
+        if not isinstance(source_files, str):
+            source_files = json.dumps(source_files)
+        
+        sql = """
+        INSERT INTO import_batches (batch_name, source_files, import_type)
+        VALUES (?, ?, 'initial')
+        """
+        
+        return self._write(lambda conn: _insert_returning_id(conn, sql, (batch_name, source_files)))
     
     def update_import_batch(self, batch_id: int, updates: Dict[str, Any]):
         """Update import batch with results."""
         updates['completion_time'] = datetime.now().isoformat()
         self.update_record('import_batches', batch_id, updates)
+        self.checkpoint()
+    
+    def checkpoint(self):
+        """Release free pages and copy the WAL back into the database, bounding file sizes after bulk writes."""
+        try:
+            self._write(self._checkpoint, transactional=False)
+        except sqlite3.Error as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
+    
+    def _checkpoint(self, conn: sqlite3.Connection):
+        # Release free pages first (a no-op unless auto_vacuum is INCREMENTAL), then the WAL
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
     
     def update_record(self, table: str, record_id: int, updates: Dict[str, Any]):
         """Generic method to update any record."""
         if not updates:
             return
         
-        with self.get_connection() as conn:
-            set_clauses = [f"{col} = ?" for col in updates.keys()]
-            values = list(updates.values()) + [record_id]
-            
-            sql = f"UPDATE {table} SET {', '.join(set_clauses)} WHERE id = ?"
-            
-            try:
-                conn.execute(sql, values)
-                conn.commit()
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"Error updating {table} record {record_id}: {e}")
-                raise
\ No newline at end of file
+        columns = tuple(sorted(updates))
+        values = [updates[column] for column in columns] + [record_id]
+        sql = _update_sql(table, columns)
+        
+        try:
+            self._write(lambda conn: conn.execute(sql, values).rowcount)
+        except Exception as e:
+            logger.error(f"Error updating {table} record {record_id}: {e}")
+            raise
\ No newline at end of file
@@ -17,6 +17,7 @@ CREATE TABLE members (
     -- ========================================================================
     full_name TEXT NOT NULL,
     full_name_normalized TEXT, -- lowercase, standardized format for matching
+    name_block_key TEXT,       -- Soundex of the surname, for duplicate candidate blocking
     nickname TEXT,
     nickname_normalized TEXT,
     birth_date DATE,
@@ -248,6 +249,7 @@ CREATE TABLE import_batches (
     
     -- Source Information
     source_files TEXT,                   -- JSON array of files processed
+    source_files_count INTEGER GENERATED ALWAYS AS (json_array_length(source_files)) VIRTUAL,
     import_type TEXT,                    -- 'initial', 'update', 'merge', 'verification'
     
     -- Results
@@ -398,7 +400,10 @@ CREATE TABLE query_log (
 
 -- Primary search indexes
 CREATE INDEX idx_members_name ON members(full_name_normalized);
+CREATE INDEX idx_members_block_key ON members(name_block_key);
+CREATE INDEX idx_members_block_prefix ON members(name_block_key, substr(full_name_normalized, 1, 3));
 CREATE INDEX idx_members_email ON members(primary_email);
+CREATE INDEX idx_members_secondary_email ON members(secondary_email) WHERE secondary_email IS NOT NULL;
 CREATE INDEX idx_members_batch ON members(batch_normalized);
 CREATE INDEX idx_members_chapter ON members(school_chapter_normalized);
 CREATE INDEX idx_members_profession ON members(current_profession_normalized);
@@ -411,6 +416,12 @@ CREATE INDEX idx_members_duplicate ON members(is_duplicate);
 CREATE INDEX idx_members_data_vintage ON members(estimated_data_vintage);
 CREATE INDEX idx_members_confidence ON members(confidence_score);
 
+-- Search and listing order: walked in order so LIMIT stops early instead of sorting;
+-- searches always exclude duplicates, so their index leaves those rows out
+CREATE INDEX idx_members_conf_name ON members(confidence_score DESC, full_name) WHERE is_duplicate = FALSE;
+CREATE INDEX idx_members_recent ON members(updated_at DESC, full_name);
+CREATE INDEX idx_members_updated ON members(updated_at);  -- Keyset pages on (updated_at, id)
+
 -- Audit trail indexes
 CREATE INDEX idx_history_member ON member_change_history(member_id);
 CREATE INDEX idx_history_date ON member_change_history(changed_at);
@@ -421,8 +432,9 @@ CREATE INDEX idx_services_member ON member_services(member_id);
 CREATE INDEX idx_services_category ON member_services(service_category_id);
 CREATE INDEX idx_services_available ON member_services(available_for_consultation);
 
--- Full-text search index (if supported)
--- CREATE VIRTUAL TABLE members_fts USING fts5(full_name, profession, company, address, content=members);
+-- Full-text search index: members_fts (FTS5, external content) and its sync
+-- triggers are created by DatabaseManager._ensure_search_schema, which also
+-- adds them to databases created before the index existed.
 
 -- ============================================================================
 -- VIEWS FOR COMMON QUERIES
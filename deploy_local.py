@@ -10,6 +10,7 @@ import os
 import sys
 import subprocess
 import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 def check_python_version():
@@ -31,24 +32,20 @@ def check_database():
             print("❌ Database creation failed!")
             return False
     
-    # Check member count
+    # Check member count, on one connection for both probes
     try:
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.execute("SELECT COUNT(*) FROM members")
-        count = cursor.fetchone()[0]
-        conn.close()
-        
-        if count == 0:
-            print("📥 No data found. Importing from Raw_Files...")
-            result = subprocess.run([sys.executable, "run.py", "--import"])
-            if result.returncode != 0:
-                print("⚠️  Data import had issues, but continuing...")
+        with closing(sqlite3.connect(str(db_path))) as conn:
+            # Stops at the first row instead of counting them all
+            has_members = conn.execute("SELECT EXISTS (SELECT 1 FROM members)").fetchone()[0]
+            
+            if not has_members:
+                print("📥 No data found. Importing from Raw_Files...")
+                result = subprocess.run([sys.executable, "run.py", "--import"])
+                if result.returncode != 0:
+                    print("⚠️  Data import had issues, but continuing...")
             
-            # Recheck count
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.execute("SELECT COUNT(*) FROM members")
-            count = cursor.fetchone()[0]
-            conn.close()
+            # Queried after the import has exited, so it sees the imported rows
+            count = conn.execute("SELECT COUNT(*) FROM members").fetchone()[0]
         
         print(f"📊 Database contains {count} members")
         return True
@@ -60,7 +57,7 @@ def check_database():
 def check_dependencies():
     """Check and install required dependencies."""
     required_packages = [
-        'streamlit', 'pandas', 'fuzzywuzzy', 'python-levenshtein',
+        'streamlit', 'pandas', 'rapidfuzz',
         'xlrd', 'openpyxl', 'chardet'
     ]
     
@@ -39,10 +39,10 @@ echo "📊 Database contains $db_size members"
 
 # Install required packages if missing
 echo "📦 Checking dependencies..."
-python3 -c "import streamlit, pandas, fuzzywuzzy" 2>/dev/null
+python3 -c "import streamlit, pandas, rapidfuzz" 2>/dev/null
 if [ $? -ne 0 ]; then
     echo "📦 Installing missing dependencies..."
-    pip3 install streamlit pandas fuzzywuzzy python-levenshtein xlrd openpyxl chardet
+    pip3 install streamlit pandas rapidfuzz xlrd openpyxl chardet
 fi
 
 # Create logs directory
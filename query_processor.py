@@ -3,15 +3,231 @@
 
 import re
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 from datetime import datetime
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 
 from database import DatabaseManager
 from config import PROFESSION_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
+# Query intent patterns, in the order _detect_query_intent tries them
+_LOCATION_INTENT_PATTERNS = (
+    r'who (?:lives?|resides?|is) (?:in|at|from|near) (.+)',
+    r'(?:show|find|list|get) (?:me |all )?(?:people|members|everyone) (?:in|at|from|near) (.+)',
+    r'(?:anyone|somebody|someone) (?:in|at|from|near) (.+)',
+    r'members? (?:in|at|from|near) (.+)',
+    r'from (.+?)(?:\s|$)',
+)
+_BATCH_INTENT_PATTERNS = (
+    r'batch (\w+[-\s]?\w*)',
+    r'from (?:batch |the batch )?(\w+[-\s]?\w*)',
+    r'(?:show|find|list) (?:me )?(?:batch |the batch )?(\w+[-\s]?\w*)',
+)
+_PROFESSIONAL_INTENT_PATTERNS = (
+    r'(?:need|looking for|find me) (?:a |an )?(?:lawyer|doctor|engineer|accountant|consultant)',
+    r'(?:lawyer|doctor|engineer|accountant|consultant)',
+    r'(?:legal|medical|engineering|accounting|consulting) (?:help|services|advice)',
+)
+_INTEREST_INTENT_PATTERNS = (
+    r'(?:who|anyone) (?:likes?|enjoys?|plays?|rides?|does?) (.+)',
+    r'(?:find|show) (?:me )?(?:people|members) (?:who )?(?:like|enjoy|play|ride|do) (.+)',
+    r'(?:who|anyone) (?:can help|knows about|has experience with) (?:me )?(?:with |buy |sell |find )?(.+)',
+    r'(?:need|want) to (?:buy|sell|find|get) (.+)',
+    r'(?:interested in|into) (.+)',
+    r'hobbies? (?:include?|are?) (.+)',
+    r'sports? (.+)',
+)
+_DEMOGRAPHIC_INTENT_PATTERNS = (
+    r'how many (?:people|members)',
+    r'(?:count|total) (?:of )?(?:people|members)',
+    r'list (?:all|everyone)',
+    r'(?:show|get) (?:me )?(?:all|everyone|everybody)',
+)
+_TRAILING_PUNCTUATION_RE = re.compile(r'[?!.,;]+$')
+
+# (intent type, field filled from the pattern's capture group) per pattern list
+_INTENT_GROUPS = (
+    ('location_based', 'location', _LOCATION_INTENT_PATTERNS),
+    ('batch_based', 'batch', _BATCH_INTENT_PATTERNS),
+    ('professional_service', None, _PROFESSIONAL_INTENT_PATTERNS),
+    ('interest_based', 'interest', _INTEREST_INTENT_PATTERNS),
+    ('demographic', None, _DEMOGRAPHIC_INTENT_PATTERNS),
+)
+# Every intent pattern, compiled once, with its intent type and field
+_INTENT_PATTERNS = tuple((intent_type, field, re.compile(pattern))
+                         for intent_type, field, patterns in _INTENT_GROUPS for pattern in patterns)
+# Distinct lowercased queries whose intent is remembered (repeats come from re-renders and paging)
+_INTENT_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=_INTENT_CACHE_SIZE)
+def _detect_intent(query_lower: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """(intent type, field, extracted value) of a lowercased query; field and value are None if unused."""
+    # Location, batch, professional service, interest and demographic patterns, in that order
+    for intent_type, field, pattern in _INTENT_PATTERNS:
+        match = pattern.search(query_lower)
+        if not match:
+            continue
+        
+        if not field:
+            return intent_type, None, None
+        value = match.group(1).strip()
+        if field == 'interest':
+            # Clean punctuation from extracted interest
+            value = _TRAILING_PUNCTUATION_RE.sub('', value)
+        return intent_type, field, value
+    
+    # General directory search (fallback)
+    return 'general_directory', None, None
+
+# Query component patterns for the _extract_* and _parse_* helpers
+_NAMED_RE = re.compile(r'(?:named?|called) ([a-zA-Z\s]+)')
+_QUOTED_NAME_RE = re.compile(r'["\'](.*?)["\']')
+_NAME_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'find\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'looking for\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'contact\s+([A-Z][a-z]+\s+[A-Z][a-z]+)'
+])
+_COMPANY_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(?:connected to|works at|from|at) ([A-Z][a-zA-Z\s]+)',
+    r'(?:company|organization|office) (?:of |called )?([A-Z][a-zA-Z\s]+)',
+    r'(?:deped|doh|dost|dict|dilg|dof|dswd|denr|da|dtr|dtwd)',  # Government agencies
+    r'(?:abs[-\s]?cbn|gma|tv5|pnp|afp|bsp|bpi|bdo|metrobank)',  # Major companies
+])
+_LOCATION_EXTRACT_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'in\s+([a-z\s]+?)(?:\s|$)',
+    r'at\s+([a-z\s]+?)(?:\s|$)',
+    r'near\s+([a-z\s]+?)(?:\s|$)',
+    r'from\s+([a-z\s]+?)(?:\s|$)',
+    r'based in\s+([a-z\s]+?)(?:\s|$)'
+])
+_BATCH_EXTRACT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'batch\s+(\d{2,4}[-\s]*[A-Z]*\d*)',
+    r'(\d{2,4}[-\s]*[A-Z]+\d*)',
+    r'(\d{4})\s+batch',
+    r'batch\s+(\d{4})'
+])
+
+# Lookup tables for the _extract_* helpers; keywords are lowercase and tried in order
+_PROFESSION_QUERY_SYNONYMS = {
+    'Legal': ['lawyer', 'attorney', 'legal advice', 'legal help', 'counsel'],
+    'Medical': ['doctor', 'physician', 'medical help', 'healthcare', 'health'],
+    'Engineering': ['engineer', 'engineering services', 'technical'],
+    'Business': ['business consultant', 'financial advisor', 'accountant'],
+    'IT/Technology': ['programmer', 'developer', 'it support', 'tech help']
+}
+# (keyword, profession): PROFESSION_KEYWORDS first, then the synonyms
+_PROFESSION_QUERY_KEYWORDS = tuple(
+    [(keyword.lower(), profession) for profession, keywords in PROFESSION_KEYWORDS.items() for keyword in keywords]
+    + [(synonym, profession) for profession, synonyms in _PROFESSION_QUERY_SYNONYMS.items() for synonym in synonyms]
+)
+# Philippine locations
+_PH_LOCATIONS = (
+    'makati', 'manila', 'quezon city', 'qc', 'pasig', 'taguig', 'bgc',
+    'mandaluyong', 'pasay', 'paranaque', 'las pinas', 'muntinlupa',
+    'marikina', 'ortigas', 'alabang', 'eastwood', 'rockwell',
+    'cebu', 'davao', 'iloilo', 'bacolod', 'cagayan de oro',
+    'bulacan', 'cavite', 'laguna', 'rizal', 'batangas'
+)
+_CHAPTERS = (
+    'up diliman', 'upd', 'diliman',
+    'up los banos', 'uplb', 'los banos',
+    'up cebu', 'upc', 'cebu',
+    'up iloilo', 'upi', 'iloilo',
+    'ust', 'santo tomas',
+    'feu', 'far eastern',
+    'ue', 'university of the east',
+    'lyceum'
+)
+
+# Synonyms of common professions for _fuzzy_match_professions
+_PROFESSION_MATCH_SYNONYMS = {
+    'doctor': ['physician', 'md', 'medical doctor', 'medic'],
+    'lawyer': ['attorney', 'legal counsel', 'advocate', 'solicitor'],
+    'engineer': ['engr', 'engineering', 'technical'],
+    'teacher': ['educator', 'professor', 'instructor', 'faculty'],
+    'nurse': ['rn', 'registered nurse', 'nursing'],
+    'architect': ['architectural', 'design'],
+    'accountant': ['cpa', 'accounting', 'bookkeeper'],
+    'manager': ['management', 'supervisor', 'director'],
+    'consultant': ['consulting', 'advisor', 'specialist']
+}
+
+# Member location columns _generate_location_match_reasons checks, in order
+_MATCH_LOCATION_COLUMNS = (
+    'home_address_city_normalized', 'office_address_city_normalized',
+    'home_address_full', 'office_address_full'
+)
+
+def _fuzzy_matches(queries: List[str], choices: Set[str], scorer, score_cutoff: float) -> Set[str]:
+    """Choices scoring above score_cutoff against any query; one rapidfuzz call scores all choices per query."""
+    choices = list(choices)
+    matches = set()
+    for query in queries:
+        matches.update(choice for choice, score, _ in process.extract(query, choices, scorer=scorer,
+                                                                      score_cutoff=score_cutoff, limit=None)
+                       if score > score_cutoff)
+    return matches
+
+# Per-search (output key, member column) pairs _format_member adds after the common fields
+_LOCATION_RESULT_FIELDS = (('home_address', 'home_address_full'), ('work_address', 'office_address_full'))
+_INTEREST_RESULT_FIELDS = (('interests', 'interests_hobbies'), ('sports', 'sports_activities'))
+
+def _format_member(member: Dict[str, Any], query_type: str, match_reasons: List[str],
+                   extra_fields: Tuple[Tuple[str, str], ...] = ()) -> Dict[str, Any]:
+    """Result dict of a natural language search: the common fields, extra_fields, then the match context.
+    
+    The common fields stay a dict literal, which CPython builds faster than a table-driven loop.
+    """
+    result = {
+        'id': member['id'],
+        'name': member.get('full_name', 'N/A'),
+        'email': member.get('primary_email', 'N/A'),
+        'mobile': member.get('mobile_phone', 'N/A'),
+        'profession': member.get('current_profession', 'N/A'),
+        'company': member.get('current_company', 'N/A'),
+        'batch': member.get('batch_normalized', 'N/A'),
+        'chapter': member.get('school_chapter_normalized', 'N/A'),
+        'home_location': member.get('home_address_city_normalized', 'N/A'),
+        'work_location': member.get('office_address_city_normalized', 'N/A')
+    }
+    for key, column in extra_fields:
+        result[key] = member.get(column, 'N/A')
+    result['confidence_score'] = member.get('confidence_score', 0)
+    result['match_reasons'] = match_reasons
+    result['query_type'] = query_type
+    return result
+
+def _comma_items(text: str) -> List[str]:
+    """Stripped, non-empty items of a (lowercased) comma-separated field."""
+    return [item.strip() for item in text.split(',') if item.strip()] if text else []
+
+def _normalize_member(member: Dict[str, Any], locations: bool = False, interests: bool = False,
+                      professions: bool = False) -> Dict[str, Any]:
+    """Attach lowercased copies (_*_lc keys) of the fields a search path scores, computed once per result.
+    
+    Home and work cities are always attached; the flags add the field groups only some paths read.
+    """
+    member['_home_city_lc'] = (member.get('home_address_city_normalized') or '').lower()
+    member['_work_city_lc'] = (member.get('office_address_city_normalized') or '').lower()
+    if locations:
+        # In _MATCH_LOCATION_COLUMNS order
+        member['_locations_lc'] = (member['_home_city_lc'], member['_work_city_lc'],
+                                   (member.get('home_address_full') or '').lower(),
+                                   (member.get('office_address_full') or '').lower())
+    if interests:
+        member['_interests_lc'] = (member.get('interests_hobbies') or '').lower()
+        member['_sports_lc'] = (member.get('sports_activities') or '').lower()
+        member['_interests_lc_parts'] = _comma_items(member['_interests_lc'])
+        member['_sports_lc_parts'] = _comma_items(member['_sports_lc'])
+    if professions:
+        member['_profession_lc'] = (member.get('current_profession_normalized') or '').lower()
+        member['_inferred_profession_lc'] = (member.get('inferred_profession') or '').lower()
+    return member
+
 class QueryProcessor:
     """Processes natural language queries for professional services and directory searches."""
     
@@ -49,99 +265,14 @@ class QueryProcessor:
     
     def _detect_query_intent(self, query: str) -> Dict[str, Any]:
         """Detect the intent and type of a natural language query."""
-        query_lower = query.lower()
-        
-        # Location-based queries
-        location_patterns = [
-            r'who (?:lives?|resides?|is) (?:in|at|from|near) (.+)',
-            r'(?:show|find|list|get) (?:me |all )?(?:people|members|everyone) (?:in|at|from|near) (.+)',
-            r'(?:anyone|somebody|someone) (?:in|at|from|near) (.+)',
-            r'members? (?:in|at|from|near) (.+)',
-            r'from (.+?)(?:\s|$)'
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, query_lower)
-            if match:
-                return {
-                    'type': 'location_based',
-                    'location': match.group(1).strip(),
-                    'original_query': query
-                }
-        
-        # Batch-based queries
-        batch_patterns = [
-            r'batch (\w+[-\s]?\w*)',
-            r'from (?:batch |the batch )?(\w+[-\s]?\w*)',
-            r'(?:show|find|list) (?:me )?(?:batch |the batch )?(\w+[-\s]?\w*)',
-        ]
-        
-        for pattern in batch_patterns:
-            match = re.search(pattern, query_lower)
-            if match:
-                return {
-                    'type': 'batch_based',
-                    'batch': match.group(1).strip(),
-                    'original_query': query
-                }
-        
-        # Professional service queries - more specific patterns
-        professional_patterns = [
-            r'(?:need|looking for|find me) (?:a |an )?(?:lawyer|doctor|engineer|accountant|consultant)',
-            r'(?:lawyer|doctor|engineer|accountant|consultant)',
-            r'(?:legal|medical|engineering|accounting|consulting) (?:help|services|advice)'
-        ]
-        
-        for pattern in professional_patterns:
-            if re.search(pattern, query_lower):
-                return {
-                    'type': 'professional_service',
-                    'original_query': query
-                }
-        
-        # Interest-based queries
-        interest_patterns = [
-            r'(?:who|anyone) (?:likes?|enjoys?|plays?|rides?|does?) (.+)',
-            r'(?:find|show) (?:me )?(?:people|members) (?:who )?(?:like|enjoy|play|ride|do) (.+)',
-            r'(?:who|anyone) (?:can help|knows about|has experience with) (?:me )?(?:with |buy |sell |find )?(.+)',
-            r'(?:need|want) to (?:buy|sell|find|get) (.+)',
-            r'(?:interested in|into) (.+)',
-            r'hobbies? (?:include?|are?) (.+)',
-            r'sports? (.+)'
-        ]
-        
-        for pattern in interest_patterns:
-            match = re.search(pattern, query_lower)
-            if match:
-                # Clean punctuation from extracted interest
-                interest = match.group(1).strip()
-                interest = re.sub(r'[?!.,;]+$', '', interest)  # Remove trailing punctuation
-                return {
-                    'type': 'interest_based',
-                    'interest': interest,
-                    'original_query': query
-                }
-        
-        # Demographic queries
-        demographic_patterns = [
-            r'how many (?:people|members)',
-            r'(?:count|total) (?:of )?(?:people|members)',
-            r'list (?:all|everyone)',
-            r'(?:show|get) (?:me )?(?:all|everyone|everybody)'
-        ]
-        
-        for pattern in demographic_patterns:
-            if re.search(pattern, query_lower):
-                return {
-                    'type': 'demographic',
-                    'original_query': query
-                }
-        
-        # General directory search (fallback)
-        return {
-            'type': 'general_directory',
-            'original_query': query
-        }
+        # The pattern matching is cached per lowercased query; each call gets a fresh dict
+        intent_type, field, value = _detect_intent(query.lower())
+        
+        intent = {'type': intent_type}
+        if field:
+            intent[field] = value
+        intent['original_query'] = query
+        return intent
     
     def _search_by_location(self, query: str, query_intent: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search for members by location."""
@@ -153,31 +284,25 @@ class QueryProcessor:
         }
         
         # Execute search
-        results = self.db.search_members(search_params)
+        results = [_normalize_member(member, locations=True) for member in self.db.search_members(search_params)]
+        
+        # Fuzzy-score the distinct locations of all results, then the words of those still unmatched,
+        # against the search once; substring matches need no scoring
+        location_lower = location.lower()
+        fuzzy_locations = {loc for member in results for loc in member['_locations_lc']
+                           if loc and location_lower not in loc}
+        similar_locations = _fuzzy_matches([location_lower], fuzzy_locations, fuzz.partial_ratio, 80)
+        matching_words = _fuzzy_matches(location_lower.split(),
+                                        {word for loc in fuzzy_locations - similar_locations for word in loc.split()},
+                                        fuzz.ratio, 85)
         
         # Format results with location context
-        formatted_results = []
-        for member in results:
-            formatted_result = {
-                'id': member['id'],
-                'name': member.get('full_name', 'N/A'),
-                'email': member.get('primary_email', 'N/A'),
-                'mobile': member.get('mobile_phone', 'N/A'),
-                'profession': member.get('current_profession', 'N/A'),
-                'company': member.get('current_company', 'N/A'),
-                'batch': member.get('batch_normalized', 'N/A'),
-                'chapter': member.get('school_chapter_normalized', 'N/A'),
-                'home_location': member.get('home_address_city_normalized', 'N/A'),
-                'work_location': member.get('office_address_city_normalized', 'N/A'),
-                'home_address': member.get('home_address_full', 'N/A'),
-                'work_address': member.get('office_address_full', 'N/A'),
-                'confidence_score': member.get('confidence_score', 0),
-                'match_reasons': self._generate_location_match_reasons(member, location),
-                'query_type': 'location_search'
-            }
-            formatted_results.append(formatted_result)
-        
-        return formatted_results
+        return [
+            _format_member(member, 'location_search',
+                           self._generate_location_match_reasons(member, location, similar_locations, matching_words),
+                           _LOCATION_RESULT_FIELDS)
+            for member in results
+        ]
     
     def _search_by_batch(self, query: str, query_intent: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search for members by batch."""
@@ -189,26 +314,7 @@ class QueryProcessor:
         
         results = self.db.search_members(search_params)
         
-        formatted_results = []
-        for member in results:
-            formatted_result = {
-                'id': member['id'],
-                'name': member.get('full_name', 'N/A'),
-                'email': member.get('primary_email', 'N/A'),
-                'mobile': member.get('mobile_phone', 'N/A'),
-                'profession': member.get('current_profession', 'N/A'),
-                'company': member.get('current_company', 'N/A'),
-                'batch': member.get('batch_normalized', 'N/A'),
-                'chapter': member.get('school_chapter_normalized', 'N/A'),
-                'home_location': member.get('home_address_city_normalized', 'N/A'),
-                'work_location': member.get('office_address_city_normalized', 'N/A'),
-                'confidence_score': member.get('confidence_score', 0),
-                'match_reasons': [f"Member of batch {batch}"],
-                'query_type': 'batch_search'
-            }
-            formatted_results.append(formatted_result)
-        
-        return formatted_results
+        return [_format_member(member, 'batch_search', [f"Member of batch {batch}"]) for member in results]
     
     def _search_by_interest(self, query: str, query_intent: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search for members by interests/hobbies."""
@@ -222,74 +328,44 @@ class QueryProcessor:
         # Execute search
         results = self.db.search_members(search_params)
         
-        # If no results with full phrase, try individual words
+        # If no results with full phrase, match any of its significant words in one query
         if not results and len(interest.split()) > 1:
-            words = interest.split()
-            for word in words:
-                if len(word) > 3:  # Only try significant words
-                    word_params = {'interests': word}
-                    word_results = self.db.search_members(word_params)
-                    results.extend(word_results)
-            
-            # Remove duplicates while preserving order
-            seen_ids = set()
-            unique_results = []
-            for result in results:
-                if result['id'] not in seen_ids:
-                    seen_ids.add(result['id'])
-                    unique_results.append(result)
-            results = unique_results
+            words = [word for word in interest.split() if len(word) > 3]
+            if words:
+                results = self.db.search_members({'interests': words})
+        results = [_normalize_member(member, interests=True) for member in results]
+        
+        # Fuzzy-score the distinct interest and sport items of all results against the search once
+        similar_items = _fuzzy_matches([interest.lower()],
+                                       {item for member in results
+                                        for item in member['_interests_lc_parts'] + member['_sports_lc_parts']},
+                                       fuzz.partial_ratio, 70)
         
         # Format results with interest context
         formatted_results = []
         for member in results:
-            formatted_result = {
-                'id': member['id'],
-                'name': member.get('full_name', 'N/A'),
-                'email': member.get('primary_email', 'N/A'),
-                'mobile': member.get('mobile_phone', 'N/A'),
-                'profession': member.get('current_profession', 'N/A'),
-                'company': member.get('current_company', 'N/A'),
-                'batch': member.get('batch_normalized', 'N/A'),
-                'chapter': member.get('school_chapter_normalized', 'N/A'),
-                'home_location': member.get('home_address_city_normalized', 'N/A'),
-                'work_location': member.get('office_address_city_normalized', 'N/A'),
-                'interests': member.get('interests_hobbies', 'N/A'),
-                'sports': member.get('sports_activities', 'N/A'),
-                'confidence_score': member.get('confidence_score', 0),
-                'match_reasons': self._generate_interest_match_reasons(member, interest),
-                'query_type': 'interest_search'
-            }
-            formatted_results.append(formatted_result)
+            similar_interests = [item for item in member['_interests_lc_parts'] if item in similar_items]
+            similar_sports = [item for item in member['_sports_lc_parts'] if item in similar_items]
+            match_reasons = self._generate_interest_match_reasons(member, interest, similar_interests, similar_sports)
+            formatted_results.append(_format_member(member, 'interest_search', match_reasons, _INTEREST_RESULT_FIELDS))
         
         return formatted_results
     
-    def _generate_interest_match_reasons(self, member: Dict[str, Any], search_interest: str) -> List[str]:
-        """Generate reasons why a member matches an interest search."""
+    def _generate_interest_match_reasons(self, member: Dict[str, Any], search_interest: str,
+                                         similar_interests: List[str], similar_sports: List[str]) -> List[str]:
+        """Generate reasons why a _normalize_member'd member matches an interest search, given its similar items."""
         reasons = []
         
-        interests = (member.get('interests_hobbies') or '').lower()
-        sports = (member.get('sports_activities') or '').lower()
         search_interest_lower = search_interest.lower()
         
-        if search_interest_lower in interests:
+        if search_interest_lower in member['_interests_lc']:
             reasons.append(f"Listed interest: {search_interest}")
         
-        if search_interest_lower in sports:
+        if search_interest_lower in member['_sports_lc']:
             reasons.append(f"Plays sport: {search_interest}")
         
-        # Use fuzzy matching to find similar interests
-        if interests:
-            for interest in interests.split(','):
-                interest = interest.strip()
-                if interest and fuzz.partial_ratio(search_interest_lower, interest) > 70:
-                    reasons.append(f"Similar interest: {interest}")
-        
-        if sports:
-            for sport in sports.split(','):
-                sport = sport.strip()
-                if sport and fuzz.partial_ratio(search_interest_lower, sport) > 70:
-                    reasons.append(f"Similar sport: {sport}")
+        reasons.extend(f"Similar interest: {interest}" for interest in similar_interests)
+        reasons.extend(f"Similar sport: {sport}" for sport in similar_sports)
         
         if not reasons:
             reasons.append("Interest match found in member data")
@@ -303,7 +379,7 @@ class QueryProcessor:
         search_params = {}
         
         # Extract name
-        name_match = re.search(r'(?:named?|called) ([a-zA-Z\s]+)', query_lower)
+        name_match = _NAMED_RE.search(query_lower)
         if name_match:
             search_params['name'] = name_match.group(1).strip()
         
@@ -338,60 +414,44 @@ class QueryProcessor:
         search_params = {}  # Empty params will get all active members
         results = self.db.search_members(search_params)
         
-        # Add demographic summary
-        total_count = len(results)
-        location_breakdown = {}
-        profession_breakdown = {}
-        batch_breakdown = {}
-        
-        for member in results:
-            # Location breakdown
-            location = member.get('home_address_city_normalized', 'Unknown')
-            location_breakdown[location] = location_breakdown.get(location, 0) + 1
-            
-            # Profession breakdown
-            profession = member.get('current_profession', 'Unknown')
-            profession_breakdown[profession] = profession_breakdown.get(profession, 0) + 1
-            
-            # Batch breakdown
-            batch = member.get('batch_normalized', 'Unknown')
-            batch_breakdown[batch] = batch_breakdown.get(batch, 0) + 1
-        
         # Add summary to first result or create summary result
         if results:
+            # Counter counts in C; most_common(5) keeps the stable top five of sorted()
+            location_breakdown = Counter(member.get('home_address_city_normalized', 'Unknown') for member in results)
+            profession_breakdown = Counter(member.get('current_profession', 'Unknown') for member in results)
+            batch_breakdown = Counter(member.get('batch_normalized', 'Unknown') for member in results)
+            
             results[0]['demographic_summary'] = {
-                'total_count': total_count,
-                'top_locations': sorted(location_breakdown.items(), key=lambda x: x[1], reverse=True)[:5],
-                'top_professions': sorted(profession_breakdown.items(), key=lambda x: x[1], reverse=True)[:5],
-                'top_batches': sorted(batch_breakdown.items(), key=lambda x: x[1], reverse=True)[:5]
+                'total_count': len(results),
+                'top_locations': location_breakdown.most_common(5),
+                'top_professions': profession_breakdown.most_common(5),
+                'top_batches': batch_breakdown.most_common(5)
             }
         
         return self._format_directory_results(results, query_intent)
     
-    def _generate_location_match_reasons(self, member: Dict[str, Any], search_location: str) -> List[str]:
-        """Generate reasons why a member matches a location search."""
+    def _generate_location_match_reasons(self, member: Dict[str, Any], search_location: str,
+                                         similar_locations: Set[str], matching_words: Set[str]) -> List[str]:
+        """Generate reasons why a _normalize_member'd member matches a location search."""
         reasons = []
         
-        # Collect all member locations
-        member_locations = [
-            member.get('home_address_city_normalized', ''),
-            member.get('office_address_city_normalized', ''),
-            member.get('home_address_full', ''),
-            member.get('office_address_full', '')
-        ]
+        # Collect all member locations, with their lowercased forms
+        member_locations = zip(map(member.get, _MATCH_LOCATION_COLUMNS), member['_locations_lc'])
         
         # Use fuzzy matching to find location matches
-        location_matches = self._fuzzy_match_locations(search_location, member_locations)
+        location_matches = self._fuzzy_match_locations(search_location, member_locations,
+                                                       similar_locations, matching_words)
         reasons.extend(location_matches)
         
         # Add specific context
         home_location = member.get('home_address_city_normalized', '')
         work_location = member.get('office_address_city_normalized', '')
+        search_location_lower = search_location.lower()
         
-        if home_location and search_location.lower() in home_location.lower():
+        if home_location and search_location_lower in member['_home_city_lc']:
             reasons.append(f"Lives in {home_location}")
         
-        if work_location and search_location.lower() in work_location.lower():
+        if work_location and search_location_lower in member['_work_city_lc']:
             reasons.append(f"Works in {work_location}")
         
         if not reasons:
@@ -399,24 +459,26 @@ class QueryProcessor:
         
         return reasons[:3]  # Limit to top 3 reasons
     
-    def _fuzzy_match_locations(self, search_location: str, member_locations: List[str]) -> List[str]:
-        """Use fuzzy matching to find location matches."""
+    def _fuzzy_match_locations(self, search_location: str, member_locations: Iterable[Tuple[str, str]],
+                               similar_locations: Set[str], matching_words: Set[str]) -> List[str]:
+        """Use fuzzy matching to find location matches among (location, lowercased location) pairs.
+        
+        similar_locations (lowercased) score above 80 by partial_ratio against the search, and
+        matching_words above 85 by ratio against one of its words; see _search_by_location.
+        """
         matches = []
         search_location_lower = search_location.lower()
         
-        for location in member_locations:
+        for location, location_lower in member_locations:
             if location:
-                location_lower = location.lower()
                 # Direct substring match
                 if search_location_lower in location_lower:
                     matches.append(f"Exact match: {location}")
                 # Fuzzy match for similar spellings
-                elif fuzz.partial_ratio(search_location_lower, location_lower) > 80:
+                elif location_lower in similar_locations:
                     matches.append(f"Similar location: {location}")
                 # Check if any word in the search matches any word in the location
-                elif any(fuzz.ratio(search_word, location_word) > 85 
-                        for search_word in search_location_lower.split()
-                        for location_word in location_lower.split()):
+                elif any(word in matching_words for word in location_lower.split()):
                     matches.append(f"Partial match: {location}")
         
         return matches
@@ -426,18 +488,9 @@ class QueryProcessor:
         matches = []
         search_profession_lower = search_profession.lower()
         
-        # Common profession synonyms
-        profession_synonyms = {
-            'doctor': ['physician', 'md', 'medical doctor', 'medic'],
-            'lawyer': ['attorney', 'legal counsel', 'advocate', 'solicitor'],
-            'engineer': ['engr', 'engineering', 'technical'],
-            'teacher': ['educator', 'professor', 'instructor', 'faculty'],
-            'nurse': ['rn', 'registered nurse', 'nursing'],
-            'architect': ['architectural', 'design'],
-            'accountant': ['cpa', 'accounting', 'bookkeeper'],
-            'manager': ['management', 'supervisor', 'director'],
-            'consultant': ['consulting', 'advisor', 'specialist']
-        }
+        # Synonym groups the search term belongs to
+        related = [(base_prof, synonyms) for base_prof, synonyms in _PROFESSION_MATCH_SYNONYMS.items()
+                   if search_profession_lower == base_prof or search_profession_lower in synonyms]
         
         for profession in member_professions:
             if profession:
@@ -446,15 +499,12 @@ class QueryProcessor:
                 if search_profession_lower in profession_lower:
                     matches.append(f"Exact match: {profession}")
                 # Fuzzy match for similar spellings
-                elif fuzz.partial_ratio(search_profession_lower, profession_lower) > 75:
+                elif fuzz.partial_ratio(search_profession_lower, profession_lower, score_cutoff=75) > 75:
                     matches.append(f"Similar profession: {profession}")
                 # Check synonyms
-                else:
-                    for base_prof, synonyms in profession_synonyms.items():
-                        if (search_profession_lower == base_prof or search_profession_lower in synonyms) and \
-                           (base_prof in profession_lower or any(syn in profession_lower for syn in synonyms)):
-                            matches.append(f"Related profession: {profession}")
-                            break
+                elif any(base_prof in profession_lower or any(syn in profession_lower for syn in synonyms)
+                         for base_prof, synonyms in related):
+                    matches.append(f"Related profession: {profession}")
         
         return matches
 
@@ -469,7 +519,7 @@ class QueryProcessor:
         search_params = self._build_search_params(query_components)
         
         # Execute search
-        results = self.db.search_members(search_params)
+        results = [_normalize_member(member, professions=True) for member in self.db.search_members(search_params)]
         
         # Rank and filter results
         ranked_results = self._rank_professional_results(results, query_components)
@@ -545,18 +595,13 @@ class QueryProcessor:
         }
         
         # Extract name (if quoted or specific patterns)
-        name_match = re.search(r'["\'](.*?)["\']', query)
+        name_match = _QUOTED_NAME_RE.search(query)
         if name_match:
             components['name'] = name_match.group(1)
         else:
             # Look for name patterns
-            name_patterns = [
-                r'find\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
-                r'looking for\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
-                r'contact\s+([A-Z][a-z]+\s+[A-Z][a-z]+)'
-            ]
-            for pattern in name_patterns:
-                match = re.search(pattern, query)
+            for pattern in _NAME_PATTERNS:
+                match = pattern.search(query)
                 if match:
                     components['name'] = match.group(1)
                     break
@@ -585,40 +630,17 @@ class QueryProcessor:
     
     def _extract_profession(self, query: str) -> Optional[str]:
         """Extract profession from query text."""
-        # Direct profession matches
-        for profession, keywords in PROFESSION_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword.lower() in query:
-                    return profession
-        
-        # Common profession synonyms
-        profession_synonyms = {
-            'Legal': ['lawyer', 'attorney', 'legal advice', 'legal help', 'counsel'],
-            'Medical': ['doctor', 'physician', 'medical help', 'healthcare', 'health'],
-            'Engineering': ['engineer', 'engineering services', 'technical'],
-            'Business': ['business consultant', 'financial advisor', 'accountant'],
-            'IT/Technology': ['programmer', 'developer', 'it support', 'tech help']
-        }
-        
-        for profession, synonyms in profession_synonyms.items():
-            for synonym in synonyms:
-                if synonym in query:
-                    return profession
+        # Direct profession matches, then common synonyms
+        for keyword, profession in _PROFESSION_QUERY_KEYWORDS:
+            if keyword in query:
+                return profession
         
         return None
     
     def _extract_company(self, query: str) -> Optional[str]:
         """Extract company/organization from query text."""
-        # Company-related patterns
-        company_patterns = [
-            r'(?:connected to|works at|from|at) ([A-Z][a-zA-Z\s]+)',
-            r'(?:company|organization|office) (?:of |called )?([A-Z][a-zA-Z\s]+)',
-            r'(?:deped|doh|dost|dict|dilg|dof|dswd|denr|da|dtr|dtwd)',  # Government agencies
-            r'(?:abs[-\s]?cbn|gma|tv5|pnp|afp|bsp|bpi|bdo|metrobank)',  # Major companies
-        ]
-        
-        for pattern in company_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _COMPANY_PATTERNS:
+            match = pattern.search(query)
             if match:
                 if len(match.groups()) > 0:
                     return match.group(1).strip()
@@ -630,34 +652,18 @@ class QueryProcessor:
     
     def _extract_location(self, query: str) -> Optional[str]:
         """Extract location from query text."""
-        # Philippine locations
-        ph_locations = [
-            'makati', 'manila', 'quezon city', 'qc', 'pasig', 'taguig', 'bgc',
-            'mandaluyong', 'pasay', 'paranaque', 'las pinas', 'muntinlupa',
-            'marikina', 'ortigas', 'alabang', 'eastwood', 'rockwell',
-            'cebu', 'davao', 'iloilo', 'bacolod', 'cagayan de oro',
-            'bulacan', 'cavite', 'laguna', 'rizal', 'batangas'
-        ]
-        
-        # Location patterns
-        location_patterns = [
-            r'in\s+([a-z\s]+?)(?:\s|$)',
-            r'at\s+([a-z\s]+?)(?:\s|$)',
-            r'near\s+([a-z\s]+?)(?:\s|$)',
-            r'from\s+([a-z\s]+?)(?:\s|$)',
-            r'based in\s+([a-z\s]+?)(?:\s|$)'
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, query)
-            for match in matches:
-                match = match.strip()
-                for location in ph_locations:
-                    if location in match or fuzz.ratio(location, match) > 80:
+        # finditer: stop scanning the query at the first recognised location
+        for pattern in _LOCATION_EXTRACT_PATTERNS:
+            for found in pattern.finditer(query):
+                match = found.group(1).strip()
+                if not match:
+                    continue
+                for location in _PH_LOCATIONS:
+                    if location in match or fuzz.ratio(location, match, score_cutoff=80) > 80:
                         return location.title()
         
         # Direct location mentions
-        for location in ph_locations:
+        for location in _PH_LOCATIONS:
             if location in query:
                 return location.title()
         
@@ -701,36 +707,17 @@ class QueryProcessor:
     
     def _extract_batch(self, query: str) -> Optional[str]:
         """Extract batch information from query."""
-        batch_patterns = [
-            r'batch\s+(\d{2,4}[-\s]*[A-Z]*\d*)',
-            r'(\d{2,4}[-\s]*[A-Z]+\d*)',
-            r'(\d{4})\s+batch',
-            r'batch\s+(\d{4})'
-        ]
-        
-        for pattern in batch_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _BATCH_EXTRACT_PATTERNS:
+            match = pattern.search(query)
             if match:
                 return match.group(1)
         
         return None
     
     def _extract_chapter(self, query: str) -> Optional[str]:
-        """Extract chapter information from query."""
-        chapters = [
-            'up diliman', 'upd', 'diliman',
-            'up los banos', 'uplb', 'los banos',
-            'up cebu', 'upc', 'cebu',
-            'up iloilo', 'upi', 'iloilo',
-            'ust', 'santo tomas',
-            'feu', 'far eastern',
-            'ue', 'university of the east',
-            'lyceum'
-        ]
-        
-        query_lower = query.lower()
-        for chapter in chapters:
-            if chapter in query_lower:
+        """Extract chapter information from (lowercased) query, like the other _extract_* helpers."""
+        for chapter in _CHAPTERS:
+            if chapter in query:
                 return chapter.title()
         
         return None
@@ -786,7 +773,7 @@ class QueryProcessor:
     
     def _calculate_professional_relevance_score(self, member: Dict[str, Any], 
                                               query_components: Dict[str, Any]) -> float:
-        """Calculate relevance score for professional service matching."""
+        """Calculate relevance score for professional service matching of a _normalize_member'd member."""
         score = 0.0
         
         # Base confidence score
@@ -795,8 +782,8 @@ class QueryProcessor:
         
         # Profession match
         query_profession = (query_components.get('profession') or '').lower()
-        member_profession = (member.get('current_profession_normalized') or '').lower()
-        inferred_profession = (member.get('inferred_profession') or '').lower()
+        member_profession = member['_profession_lc']
+        inferred_profession = member['_inferred_profession_lc']
         
         if query_profession:
             if query_profession in member_profession:
@@ -813,8 +800,8 @@ class QueryProcessor:
         
         # Location match
         query_location = (query_components.get('location') or '').lower()
-        member_work_location = (member.get('office_address_city_normalized') or '').lower()
-        member_home_location = (member.get('home_address_city_normalized') or '').lower()
+        member_work_location = member['_work_city_lc']
+        member_home_location = member['_home_city_lc']
         
         if query_location:
             if query_location in member_work_location:
@@ -923,12 +910,12 @@ class QueryProcessor:
     
     def _generate_match_explanation(self, member: Dict[str, Any], 
                                   query_components: Dict[str, Any]) -> List[str]:
-        """Generate explanation of why this member matches the query."""
+        """Generate explanation of why this _normalize_member'd member matches the query."""
         reasons = []
         
         # Profession match
         query_profession = query_components.get('profession', '').lower()
-        member_profession = (member.get('current_profession_normalized') or '').lower()
+        member_profession = member['_profession_lc']
         if query_profession and query_profession in member_profession:
             reasons.append(f"Works as {member.get('current_profession')}")
         elif member.get('inferred_profession'):
@@ -937,8 +924,8 @@ class QueryProcessor:
         # Location match
         query_location = (query_components.get('location') or '').lower()
         if query_location:
-            work_location = (member.get('office_address_city_normalized') or '').lower()
-            home_location = (member.get('home_address_city_normalized') or '').lower()
+            work_location = member['_work_city_lc']
+            home_location = member['_home_city_lc']
             if query_location in work_location:
                 reasons.append(f"Works in {member.get('office_address_city_normalized')}")
             elif query_location in home_location:
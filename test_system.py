@@ -3,7 +3,11 @@
 # ============================================================================
 
 import sys
+import time
 import logging
+import tempfile
+from collections import defaultdict
+from itertools import combinations
 from pathlib import Path
 
 # Add current directory to path
@@ -132,9 +136,9 @@ def test_ai_inference():
             print(f"   Testing member {i}: {member['full_name']}")
             inference = inferencer.infer_profession_info(member)
             
-            if inference.get('inferred_profession'):
-                print(f"     Profession: {inference['inferred_profession']} "
-                      f"(confidence: {inference.get('inferred_profession_confidence', 0):.2f})")
+            if inference.inferred_profession:
+                print(f"     Profession: {inference.inferred_profession} "
+                      f"(confidence: {inference.inferred_profession_confidence:.2f})")
             else:
                 print("     No profession inferred")
         
@@ -246,6 +250,107 @@ def test_data_import():
         print(f"   ❌ Data import test failed: {e}")
         return False
 
+def test_import_deduplication():
+    """Test duplicate matching against records imported earlier in the same file."""
+    print("\n🔁 Testing Import Deduplication...")
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = DatabaseManager(Path(temp_dir) / 'dedup_test.db')
+            db.create_database()
+            processor = DataProcessor(db)
+            batch_id = db.create_import_batch('Deduplication Test', ['test_data'])
+            
+            records = [
+                # The second record shares the first one's email and renames it (longer name wins),
+                # so the third must not match the first under its old name
+                {'full_name': 'Gary R. De Castro', 'primary_email': 'gary@example.com'},
+                {'full_name': 'Ulysses Fernandez Bautista', 'primary_email': 'gary@example.com'},
+                {'full_name': 'Gary R. De Castro', 'primary_email': 'gdc@example.com'},
+                # A name contained in an earlier, similar name is the same member
+                {'full_name': 'Jose Protacio Rizal Mercado'},
+                {'full_name': 'Jose Protacio Rizal'}
+            ]
+            for record in records:
+                record['source_file_name'] = 'test_data'
+            processor._import_normalized_members(processor._normalize_members(records), batch_id)
+            
+            members = {(member['full_name'], member['primary_email'])
+                       for member in db.search_members({'limit': 100})}
+            expected = {
+                ('Ulysses Fernandez Bautista', 'gary@example.com'),
+                ('Gary R. De Castro', 'gdc@example.com'),
+                ('Jose Protacio Rizal Mercado', None)
+            }
+            if members != expected:
+                print(f"   ❌ Expected members {expected}, got {members}")
+                return False
+            print(f"   ✅ {len(records)} records imported as {len(members)} members")
+        
+        return True
+    
+    except Exception as e:
+        print(f"   ❌ Import deduplication test failed: {e}")
+        return False
+
+def test_duplicate_finder():
+    """Test the duplicate finder on a few thousand members sharing common names."""
+    print("\n👥 Testing Duplicate Finder...")
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = DatabaseManager(Path(temp_dir) / 'duplicates_test.db')
+            db.create_database()
+            
+            # 20 first names x 20 surnames, 11 members each: every surname block is oversized
+            first_names = ['maria', 'jose', 'juan', 'nestor', 'gloria', 'antonio', 'pedro', 'ana', 'carlos', 'rosa',
+                           'luis', 'elena', 'ramon', 'teresa', 'miguel', 'victor', 'ricardo', 'lourdes', 'fernando', 'isabel']
+            surnames = ['santos', 'reyes', 'cruz', 'bautista', 'ocampo', 'garcia', 'mendoza', 'torres', 'tomas', 'andrada',
+                        'castillo', 'villanueva', 'ramos', 'aquino', 'navarro', 'rivera', 'gonzales', 'flores', 'lopez', 'morales']
+            members = [
+                {'full_name_normalized': f"{first_names[i % 20]} {surnames[i // 20 % 20]}",
+                 'primary_email': 'none@example.com' if i % 10 == 0 else f"member{i}@example.com"}
+                for i in range(4400)
+            ]
+            members += [
+                {'full_name_normalized': 'lorenzo quisumbing', 'primary_email': 'lq@example.com'},
+                {'full_name_normalized': 'lorenzo m quisumbing', 'primary_email': None},
+                {'full_name_normalized': 'maria santos', 'primary_email': 'member1@example.com'}
+            ]
+            for member in members:
+                member['full_name'] = member['full_name_normalized'].title()
+            member_ids = db.insert_members(members)
+            
+            # The 440 members sharing a placeholder email are not paired on it; oversized surname
+            # blocks are only paired within a name prefix, which here means the same name
+            ids_by_name = defaultdict(list)
+            for member_id, member in zip(member_ids, members):
+                ids_by_name[member['full_name_normalized']].append(member_id)
+            expected = {pair for ids in ids_by_name.values() for pair in combinations(ids, 2)}
+            expected |= {(member_ids[-3], member_ids[-2]), (member_ids[1], member_ids[-1])}
+            
+            start = time.perf_counter()
+            pairs = {(duplicate['id1'], duplicate['id2']): duplicate['match_type']
+                     for duplicate in db.find_potential_duplicates(100000)}
+            elapsed = time.perf_counter() - start
+            if set(pairs) != expected:
+                print(f"   ❌ Expected {len(expected)} pairs, got {len(pairs)} "
+                      f"({len(set(pairs) - expected)} unexpected, {len(expected - set(pairs))} missing)")
+                return False
+            if pairs[(member_ids[1], member_ids[-1])] != 'email_match':
+                print("   ❌ Shared email not reported as an email match")
+                return False
+            if len(db.find_potential_duplicates(1)) != 1:
+                print("   ❌ Limit of 1 pair not applied")
+                return False
+            print(f"   ✅ Found {len(pairs)} duplicate pairs among {len(members)} members in {elapsed:.2f}s")
+        
+        return True
+    
+    except Exception as e:
+        print(f"   ❌ Duplicate finder test failed: {e}")
+        return False
+
 def test_full_query():
     """Test full query workflow."""
     print("\n🔍 Testing Full Query Workflow...")
@@ -296,6 +401,8 @@ def main():
         ("AI Inference", test_ai_inference),
         ("Query Processing", test_query_processing),
         ("Data Import", test_data_import),
+        ("Import Deduplication", test_import_deduplication),
+        ("Duplicate Finder", test_duplicate_finder),
         ("Full Query Workflow", test_full_query)
     ]
     
@@ -5,13 +5,129 @@ import re
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import date
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, utils
 import unicodedata
 
-from config import LOCATION_MAPPINGS, BATCH_PATTERNS
+from config import LOCATION_MAPPINGS, BATCH_REGEX
 
 logger = logging.getLogger(__name__)
 
+class KeywordMatcher:
+    """Finds every keyword contained in a text with a single compiled regex scan.
+    
+    Results are the same as testing ``keyword in text`` for each keyword, so
+    overlapping and nested keywords (e.g. 'law' inside 'family law') are all found.
+    """
+    
+    def __init__(self, keywords: List[str]):
+        # Longest first so the alternation reports the longest keyword at each position
+        unique_keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+        self.keywords = tuple(unique_keywords)
+        self.min_length = len(unique_keywords[-1]) if unique_keywords else 0
+        
+        self._pattern = None
+        if unique_keywords:
+            alternation = '|'.join(re.escape(keyword) for keyword in unique_keywords)
+            self._pattern = re.compile(f'(?=({alternation}))')
+        
+        # Every keyword that also matches wherever a longer keyword matches
+        self._prefixes = {
+            keyword: tuple(other for other in unique_keywords if keyword.startswith(other))
+            for keyword in unique_keywords
+        }
+    
+    def find(self, text: str) -> List[str]:
+        """Return the distinct keywords found in (already lowercased) text, in text order."""
+        # Texts shorter than the shortest keyword cannot contain any keyword
+        if not text or self._pattern is None or len(text) < self.min_length:
+            return []
+        
+        found = {}
+        for match in self._pattern.finditer(text):
+            for keyword in self._prefixes[match.group(1)]:
+                found[keyword] = None
+        
+        return list(found)
+
+# Soundex digit for each consonant group; vowels, h, w and y have no code
+_SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in (('1', 'bfpv'), ('2', 'cgjkqsxz'), ('3', 'dt'), ('4', 'l'), ('5', 'mn'), ('6', 'r'))
+    for letter in letters
+}
+
+def soundex(word: str) -> str:
+    """American Soundex code of a word (e.g. 'reyes' -> 'R200'); '' if it has no ASCII letters."""
+    letters = [char for char in word.lower() if 'a' <= char <= 'z']
+    if not letters:
+        return ''
+    
+    code = [letters[0].upper()]
+    previous = _SOUNDEX_CODES.get(letters[0])
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char)
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if char not in 'hw':
+            previous = digit
+    
+    return ''.join(code).ljust(4, '0')
+
+def name_block_key(normalized_name: Optional[str]) -> Optional[str]:
+    """Duplicate-detection blocking key for a normalized name: Soundex of the surname (last word)."""
+    if not normalized_name:
+        return None
+    
+    for word in reversed(normalized_name.split()):
+        code = soundex(word)
+        if code:
+            return code
+    return None
+
+def names_similar(norm1: str, norm2: str, threshold: float = 0.8) -> bool:
+    """Whether two already-normalized names score above threshold (see calculate_name_similarity)."""
+    if not norm1 or not norm2:
+        return False
+    # Skip token sort when ratio already passes
+    if fuzz.ratio(norm1, norm2) / 100.0 > threshold:
+        return True
+    return fuzz.token_sort_ratio(norm1, norm2, processor=utils.default_process) / 100.0 > threshold
+
+class NameMatcher:
+    """names_similar() for many pairs over the same names, e.g. duplicate candidates.
+    
+    Each name's token-sorted form is computed once, and scores are taken with
+    the threshold as score_cutoff so rapidfuzz can give up on hopeless pairs early.
+    """
+    
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.score_cutoff = 100 * threshold
+        self.sorted_names = {}
+    
+    def _passes(self, s1: str, s2: str) -> bool:
+        """fuzz.ratio(s1, s2) / 100 > threshold; scores under the cutoff come back as 0."""
+        if not s1 or not s2:
+            return False
+        return fuzz.ratio(s1, s2, score_cutoff=self.score_cutoff) > self.score_cutoff
+    
+    def _sorted_name(self, name: str) -> str:
+        """The string fuzz.token_sort_ratio compares for name."""
+        sorted_name = self.sorted_names.get(name)
+        if sorted_name is None:
+            sorted_name = " ".join(sorted(utils.default_process(name).split()))
+            self.sorted_names[name] = sorted_name
+        return sorted_name
+    
+    def similar(self, norm1: str, norm2: str) -> bool:
+        """Same result as names_similar(norm1, norm2, threshold)."""
+        if self._passes(norm1, norm2):
+            return True
+        return self._passes(self._sorted_name(norm1), self._sorted_name(norm2))
+
 class TextProcessor:
     """Handles text normalization, extraction, and fuzzy matching."""
     
@@ -54,57 +170,58 @@ class TextProcessor:
             'batch_era': None
         }
         
-        # Try each pattern
-        for pattern in BATCH_PATTERNS:
-            match = re.search(pattern, batch_str, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                
-                if len(groups) >= 1:
-                    # Extract year
-                    year_str = groups[0]
-                    year = int(year_str)
-                    
-                    # Convert 2-digit to 4-digit year
-                    if year < 50:
-                        year += 2000  # 01-49 = 2001-2049
-                    elif year < 100:
-                        year += 1900  # 50-99 = 1950-1999
-                    
-                    result['batch_year'] = year
-                    result['batch_decade'] = (year // 10) * 10
-                    
-                    # Determine era
-                    if 1990 <= year < 2000:
-                        result['batch_era'] = '90s'
-                    elif 2000 <= year < 2010:
-                        result['batch_era'] = '2000s'
-                    elif 2010 <= year < 2020:
-                        result['batch_era'] = '2010s'
-                    else:
-                        result['batch_era'] = f"{year}s"
+        # Single scan over all batch patterns
+        match = BATCH_REGEX.search(batch_str)
+        if match:
+            year_str = None
+            semester_str = None
+            for group_name, value in match.groupdict().items():
+                if value is None:
+                    continue
+                if group_name.startswith('year'):
+                    year_str = value
+                else:
+                    semester_str = value
+            
+            if year_str:
+                # Extract year
+                year = int(year_str)
                 
-                if len(groups) >= 2:
-                    # Extract letter/semester code
-                    semester_str = groups[1]
-                    
-                    # Extract letter and number components
-                    letter_match = re.match(r'([A-Z]+)(\d*)', semester_str, re.IGNORECASE)
-                    if letter_match:
-                        result['batch_semester'] = letter_match.group(1).upper()
-                        if letter_match.group(2):
-                            result['batch_sub_number'] = int(letter_match.group(2))
+                # Convert 2-digit to 4-digit year
+                if year < 50:
+                    year += 2000  # 01-49 = 2001-2049
+                elif year < 100:
+                    year += 1900  # 50-99 = 1950-1999
                 
-                # Build normalized format
-                if result['batch_year'] and result['batch_semester']:
-                    normalized = f"{result['batch_year']}-{result['batch_semester']}"
-                    if result['batch_sub_number']:
-                        normalized += str(result['batch_sub_number'])
-                    result['batch_normalized'] = normalized
-                elif result['batch_year']:
-                    result['batch_normalized'] = str(result['batch_year'])
+                result['batch_year'] = year
+                result['batch_decade'] = (year // 10) * 10
                 
-                break
+                # Determine era
+                if 1990 <= year < 2000:
+                    result['batch_era'] = '90s'
+                elif 2000 <= year < 2010:
+                    result['batch_era'] = '2000s'
+                elif 2010 <= year < 2020:
+                    result['batch_era'] = '2010s'
+                else:
+                    result['batch_era'] = f"{year}s"
+            
+            if semester_str:
+                # Extract letter and number components
+                letter_match = re.match(r'([A-Z]+)(\d*)', semester_str, re.IGNORECASE)
+                if letter_match:
+                    result['batch_semester'] = letter_match.group(1).upper()
+                    if letter_match.group(2):
+                        result['batch_sub_number'] = int(letter_match.group(2))
+            
+            # Build normalized format
+            if result['batch_year'] and result['batch_semester']:
+                normalized = f"{result['batch_year']}-{result['batch_semester']}"
+                if result['batch_sub_number']:
+                    normalized += str(result['batch_sub_number'])
+                result['batch_normalized'] = normalized
+            elif result['batch_year']:
+                result['batch_normalized'] = str(result['batch_year'])
         
         return result
     
@@ -166,11 +283,28 @@ class TextProcessor:
         ratio = fuzz.ratio(norm1, norm2) / 100.0
         
         # Also try token sort ratio for different word orders
-        token_ratio = fuzz.token_sort_ratio(norm1, norm2) / 100.0
+        token_ratio = fuzz.token_sort_ratio(norm1, norm2, processor=utils.default_process) / 100.0
         
         # Return the higher score
         return max(ratio, token_ratio)
     
+    def find_similar_name(self, name: str, candidates: List[str], threshold: float = 0.8) -> Optional[int]:
+        """Return the index of the first candidate more similar to name than threshold."""
+        if not name:
+            return None
+        
+        # Normalize the query once for the whole candidate list
+        norm = self.normalize_name(name)
+        
+        for index, candidate in enumerate(candidates):
+            if not candidate:
+                continue
+            
+            if names_similar(norm, self.normalize_name(candidate), threshold):
+                return index
+        
+        return None
+    
     def extract_email_domain_info(self, email: str) -> Dict[str, Any]:
         """Extract information from email domain."""
         if not email or '@' not in email: